@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""Compare the ElementTree arXiv Atom parser with the previous feedparser path."""
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from benchmarks.fixtures import arxiv_feed
+from scipaperbot.fetchers.arxiv import parse_atom
+from scipaperbot.models import Paper
+
+
+def parse_feedparser(data: bytes) -> list:
+    """The pre-ElementTree path: feedparser plus per-entry date re-parsing."""
+    import feedparser
+
+    papers = []
+    for entry in feedparser.parse(data).entries:
+        link = next((l.get("href") for l in entry.get("links", []) if l.get("rel") == "alternate"), "")
+        published = datetime(*entry.published_parsed[:6]) if entry.get("published_parsed") else datetime.utcnow()
+        updated = datetime(*entry.updated_parsed[:6]) if entry.get("updated_parsed") else None
+        papers.append(
+            Paper(
+                id=entry.get("id", ""),
+                title=entry.get("title", "").strip(),
+                authors=[a.get("name") for a in entry.get("authors", []) if a.get("name")],
+                summary=entry.get("summary", "").strip(),
+                published=published,
+                updated=updated,
+                link=link or entry.get("link", ""),
+                categories=[t.get("term") for t in entry.get("tags", []) if t.get("term")],
+                source="arXiv",
+                doi=entry.get("arxiv_doi"),
+                primary_category=(entry.get("arxiv_primary_category") or {}).get("term"),
+            )
+        )
+    return papers
+
+
+def best_of(fn, data: bytes, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn(data)
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def main(argv: list) -> int:
+    ap = argparse.ArgumentParser(description=__doc__)
+    ap.add_argument("--entries", type=int, default=300)
+    ap.add_argument("--repeat", type=int, default=5)
+    args = ap.parse_args(argv)
+
+    data = arxiv_feed(args.entries)
+    print(f"Fixture: {args.entries} entries, {len(data) / 1024:.0f} KiB")
+
+    etree = best_of(lambda d: list(parse_atom(d)), data, args.repeat)
+    print(f"ElementTree iterparse: {etree * 1000:8.1f} ms")
+    try:
+        fp = best_of(parse_feedparser, data, args.repeat)
+    except ImportError:
+        print("feedparser not installed; skipping baseline")
+        return 0
+    print(f"feedparser:            {fp * 1000:8.1f} ms  ({fp / etree:.1f}x slower)")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main(sys.argv[1:]))
@@ -0,0 +1,202 @@
+from __future__ import annotations
+
+import json
+import random
+from datetime import datetime, timedelta
+from xml.sax.saxutils import escape
+
+
+# Synthetic but realistically shaped upstream payloads for offline benchmarks.
+# Generation is seeded, so every run sees byte-identical fixtures. Each builder
+# mirrors one page of the API the matching fetcher reads: arXiv Atom, bioRxiv
+# /details JSON, PubMed ESearch JSON and EFetch XML, and Crossref /works JSON.
+
+_WORDS = (
+    "cell cells aging ageing senescence dna damage repair response protein gene expression mouse human "
+    "mitochondrial chromatin oocyte ovary tissue stress pathway signalling regulation analysis model "
+    "we show that the of and in to a with for by from during increased reduced novel role mechanism"
+).split()
+_CATEGORIES = ["q-bio.CB", "q-bio.GN", "q-bio.MN", "q-bio.QM", "q-bio.TO", "cs.CB"]
+
+
+def _sentence(rng: random.Random, n: int) -> str:
+    return " ".join(rng.choice(_WORDS) for _ in range(n))
+
+
+def arxiv_feed(n: int = 300, seed: int = 0, start: int = 0, base: datetime = datetime(2025, 11, 7, 18),
+               step: timedelta = timedelta(minutes=37)) -> bytes:
+    """An arXiv API Atom feed with `n` entries, newest first (entry i at base - i * step), ~1.3 kB of abstract each."""
+    rng = random.Random(seed)
+    entries = []
+    for i in range(start, start + n):
+        ts = (base - step * i).strftime("%Y-%m-%dT%H:%M:%SZ")
+        aid = f"2511.{10000 + i:05d}"
+        cats = rng.sample(_CATEGORIES, 2)
+        authors = "".join(
+            f"<author><name>{escape(_sentence(rng, 1).title())} {escape(_sentence(rng, 1).title())}</name></author>"
+            for _ in range(rng.randint(2, 8))
+        )
+        doi = f"<arxiv:doi>10.1234/x.{i}</arxiv:doi>" if i % 3 == 0 else ""
+        entries.append(
+            f"""  <entry>
+    <id>http://arxiv.org/abs/{aid}v1</id>
+    <updated>{ts}</updated>
+    <published>{ts}</published>
+    <title>{escape(_sentence(rng, 8).capitalize())}
+  {escape(_sentence(rng, 5))}</title>
+    <summary>  {escape(_sentence(rng, 190))}
+</summary>
+    {authors}
+    {doi}
+    <link href="http://arxiv.org/abs/{aid}v1" rel="alternate" type="text/html"/>
+    <link title="pdf" href="http://arxiv.org/pdf/{aid}v1" rel="related" type="application/pdf"/>
+    <arxiv:primary_category xmlns:arxiv="http://arxiv.org/schemas/atom" term="{cats[0]}" scheme="http://arxiv.org/schemas/atom"/>
+    <category term="{cats[0]}" scheme="http://arxiv.org/schemas/atom"/>
+    <category term="{cats[1]}" scheme="http://arxiv.org/schemas/atom"/>
+  </entry>
+"""
+        )
+    return (
+        '<?xml version="1.0" encoding="UTF-8"?>\n'
+        '<feed xmlns="http://www.w3.org/2005/Atom" xmlns:opensearch="http://a9.com/-/spec/opensearch/1.1/" '
+        'xmlns:arxiv="http://arxiv.org/schemas/atom">\n'
+        '  <title type="html">ArXiv Query</title>\n'
+        "  <id>http://arxiv.org/api/fixture</id>\n"
+        f"  <updated>{base.strftime('%Y-%m-%dT%H:%M:%S')}-05:00</updated>\n"
+        f"  <opensearch:totalResults>{start + n}</opensearch:totalResults>\n"
+        f"  <opensearch:startIndex>{start}</opensearch:startIndex>\n"
+        f"  <opensearch:itemsPerPage>{n}</opensearch:itemsPerPage>\n"
+        + "".join(entries)
+        + "</feed>\n"
+    ).encode("utf-8")
+
+
+_SYLLABLES = "ka lo mi ren sa to vi na el or zu han bek".split()
+
+
+def _name(rng: random.Random) -> str:
+    return "".join(rng.choice(_SYLLABLES) for _ in range(rng.randint(2, 4))).title()
+
+
+def rxiv_page(n: int = 100, seed: int = 0, cursor: int = 0, total: int | None = None, server: str = "biorxiv",
+              base: datetime = datetime(2025, 11, 7), step: timedelta = timedelta(hours=3)) -> bytes:
+    """
+    A bioRxiv/medRxiv /details page: rows `cursor` to `cursor + n` of a listing in
+    which every sixth row is the v2 of the DOI five rows earlier. Rows depend only
+    on their position, so consecutive pages fit together.
+    """
+    rows = []
+    for r in range(cursor, cursor + n):
+        d, version = (r - 5, 2) if r % 6 == 5 else (r, 1)
+        rng = random.Random(f"{seed}:{server}:{d}")  # same title and authors for both versions
+        doi = f"10.1101/2025.11.{1 if server == 'biorxiv' else 2}{d:06d}"
+        title = _sentence(rng, 12).capitalize()
+        authors = "; ".join(f"{_name(rng)}, {_name(rng)[0]}." for _ in range(rng.randint(2, 12)))
+        posted = base - step * d + timedelta(days=version - 1)
+        rows.append({
+            "doi": doi,
+            "title": title,
+            "authors": authors,
+            "author_corresponding": _name(rng),
+            "author_corresponding_institution": _sentence(rng, 4).title(),
+            "date": posted.strftime("%Y-%m-%d"),
+            "version": str(version),
+            "type": "new results",
+            "license": "cc_by",
+            "category": rng.choice(["cell biology", "genomics", "molecular biology"]),
+            "jatsxml": f"https://www.biorxiv.org/content/early/{doi}v{version}.source.xml",
+            "abstract": _sentence(rng, 220 + 10 * version).capitalize() + ".",
+            "published": "NA",
+            "server": server,
+        })
+    return json.dumps({
+        "messages": [{"status": "ok", "interval": f"{(base - step * (cursor + n)).date()}:{base.date()}",
+                      "cursor": cursor, "count": len(rows),
+                      "total": total if total is not None else cursor + n}],
+        "collection": rows,
+    }).encode("utf-8")
+
+
+def pubmed_esearch(count: int = 200, webenv: str = "MCID_fixture") -> bytes:
+    """An ESearch (usehistory=y, retmax=0) JSON reply reporting `count` hits."""
+    return json.dumps({
+        "header": {"type": "esearch", "version": "0.3"},
+        "esearchresult": {"count": str(count), "retmax": "0", "retstart": "0", "idlist": [],
+                          "querykey": "1", "webenv": webenv, "translationset": [], "querytranslation": ""},
+    }).encode("utf-8")
+
+
+def pubmed_efetch(n: int = 200, seed: int = 0, start: int = 0, base: datetime = datetime(2025, 11, 28),
+                  step: timedelta = timedelta(hours=3)) -> bytes:
+    """An EFetch PubmedArticleSet with `n` articles (article i dated base - i * step), half with structured abstracts."""
+    rng = random.Random(seed)
+    articles = []
+    for i in range(start, start + n):
+        pmid = 40000000 + i
+        if i % 2:
+            abstract = "".join(
+                f'<AbstractText Label="{label}" NlmCategory="{label}">{escape(_sentence(rng, 55))}</AbstractText>'
+                for label in ("BACKGROUND", "METHODS", "RESULTS", "CONCLUSIONS")
+            )
+        else:
+            abstract = f"<AbstractText>{escape(_sentence(rng, 210))}</AbstractText>"
+        authors = "".join(
+            f'<Author ValidYN="Y"><LastName>{_name(rng)}</LastName><ForeName>{_name(rng)}</ForeName>'
+            f"<Initials>{_name(rng)[0]}</Initials></Author>"
+            for _ in range(rng.randint(3, 15))
+        )
+        pub = base - step * i
+        articles.append(
+            f"""<PubmedArticle><MedlineCitation Status="PubMed-not-MEDLINE" Owner="NLM">
+<PMID Version="1">{pmid}</PMID>
+<Article PubModel="Print-Electronic"><Journal><ISSN IssnType="Electronic">1234-5678</ISSN>
+<JournalIssue CitedMedium="Internet"><Volume>12</Volume><Issue>3</Issue>
+<PubDate><Year>{pub.year}</Year><Month>{pub.strftime("%b")}</Month><Day>{pub.day:02d}</Day></PubDate></JournalIssue>
+<Title>{escape(_sentence(rng, 3).title())}</Title></Journal>
+<ArticleTitle>{escape(_sentence(rng, 14).capitalize())}.</ArticleTitle>
+<Abstract>{abstract}</Abstract>
+<AuthorList CompleteYN="Y">{authors}</AuthorList>
+<ELocationID EIdType="doi" ValidYN="Y">10.5555/fixture.{i}</ELocationID>
+<ArticleDate DateType="Electronic"><Year>{pub.year}</Year><Month>{pub.month:02d}</Month><Day>{pub.day:02d}</Day></ArticleDate>
+</Article></MedlineCitation>
+<PubmedData><History><PubMedPubDate PubStatus="entrez"><Year>{pub.year}</Year><Month>{pub.month}</Month>
+<Day>{pub.day}</Day><Hour>{pub.hour}</Hour><Minute>{pub.minute}</Minute></PubMedPubDate></History><ArticleIdList><ArticleId IdType="pubmed">{pmid}</ArticleId>
+<ArticleId IdType="doi">10.5555/fixture.{i}</ArticleId></ArticleIdList></PubmedData></PubmedArticle>
+"""
+        )
+    return (
+        '<?xml version="1.0" ?>\n<!DOCTYPE PubmedArticleSet PUBLIC "-//NLM//DTD PubMedArticle, 1st January 2025//EN" '
+        '"https://dtd.nlm.nih.gov/ncbi/pubmed/out/pubmed_250101.dtd">\n<PubmedArticleSet>\n'
+        + "".join(articles)
+        + "</PubmedArticleSet>\n"
+    ).encode("utf-8")
+
+
+def crossref_page(n: int = 1000, seed: int = 0, start: int = 0, next_cursor: str | None = "fixture-cursor",
+                  total: int | None = None, base: datetime = datetime(2025, 11, 28),
+                  step: timedelta = timedelta(hours=3)) -> bytes:
+    """A Crossref /works page (select= projection) of ChemRxiv works with JATS abstracts, newest first."""
+    rng = random.Random(seed)
+    items = []
+    for i in range(start, start + n):
+        pub = base - step * i
+        parts = [[pub.year, pub.month, pub.day]]
+        stamp = pub.strftime("%Y-%m-%dT10:00:00Z")
+        items.append({
+            "DOI": f"10.26434/chemrxiv-2025-{i:05d}",
+            "title": [_sentence(rng, 11).capitalize()],
+            "author": [{"given": _name(rng), "family": _name(rng), "sequence": "additional", "affiliation": []}
+                       for _ in range(rng.randint(2, 9))],
+            "abstract": "<jats:p>" + escape(_sentence(rng, 120)) + "</jats:p><jats:p>"
+                        + escape(_sentence(rng, 80)) + "</jats:p>",
+            "URL": f"https://doi.org/10.26434/chemrxiv-2025-{i:05d}",
+            "published-online": {"date-parts": parts},
+            "created": {"date-parts": parts, "date-time": stamp},
+            "deposited": {"date-parts": parts, "date-time": stamp},
+        })
+    return json.dumps({
+        "status": "ok",
+        "message-type": "work-list",
+        "message": {"items-per-page": n, "total-results": total if total is not None else start + n,
+                    "next-cursor": next_cursor, "items": items},
+    }).encode("utf-8")
@@ -0,0 +1,240 @@
+#!/usr/bin/env python3
+"""Local stand-in for the arXiv, bioRxiv/medRxiv, E-utilities and Crossref APIs the fetchers call."""
+from __future__ import annotations
+
+import argparse
+import json
+import math
+import random
+import sys
+import threading
+import time
+from collections import Counter
+from datetime import date, datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from benchmarks.fixtures import arxiv_feed, crossref_page, pubmed_efetch, pubmed_esearch, rxiv_page
+
+
+# Serves the fixture payloads from fixtures.py on the request paths the fetchers
+# use, so update_papers.py can run end to end against it (set fetch.base_urls in
+# config.yaml to this server for every source). Each source has `papers` items
+# spread evenly over the last `days` days, newest first; date-windowed endpoints
+# (bioRxiv /details, ESearch, Crossref filters) only count the items inside the
+# window, and paging follows each API's own scheme (start=, cursor path segment,
+# WebEnv + retstart, next-cursor). Every request can be delayed, answered with
+# 429 + Retry-After or with a 503, at the configured rates. GET /_stats returns
+# the request counts by endpoint and status.
+
+RXIV_PAGE = 100  # rows per /details page, as on api.biorxiv.org
+
+
+class Upstream:
+    def __init__(
+        self,
+        papers: int = 2000,
+        days: float = 7,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        error_rate: float = 0.0,
+        throttle_rate: float = 0.0,
+        retry_after: float = 1.0,
+        seed: int = 0,
+    ) -> None:
+        self.papers = max(1, papers)
+        self.now = datetime.utcnow().replace(microsecond=0)
+        self.step = timedelta(days=days) / self.papers
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.throttle_rate = throttle_rate
+        self.retry_after = retry_after
+        self.seed = seed
+        self.stats: Counter = Counter()
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def roll(self) -> float:
+        with self._lock:
+            return self._rng.random()
+
+    def count(self, key: str) -> None:
+        with self._lock:
+            self.stats[key] += 1
+
+    def window(self, start: date, end: date) -> Tuple[int, int]:
+        """Index range [lo, hi) of the items dated within [start, end] (item i is dated now - i * step)."""
+        after_end = datetime.combine(end + timedelta(days=1), datetime.min.time())
+        since = datetime.combine(start, datetime.min.time())
+        lo = max(0, math.floor((self.now - after_end) / self.step) + 1)
+        hi = min(self.papers, math.floor((self.now - since) / self.step) + 1)
+        return lo, max(lo, hi)
+
+    # ---- endpoints: each returns (content type, body) -------------------------
+
+    def arxiv(self, q: Dict[str, str]) -> Tuple[str, bytes]:
+        start = int(q.get("start", 0))
+        n = max(0, min(int(q.get("max_results", 100)), self.papers - start))
+        return "application/atom+xml", arxiv_feed(n, seed=self.seed + start, start=start, base=self.now, step=self.step)
+
+    def rxiv(self, server: str, start: str, end: str, cursor: str) -> Tuple[str, bytes]:
+        lo, hi = self.window(date.fromisoformat(start), date.fromisoformat(end))
+        offset = int(cursor)
+        n = max(0, min(RXIV_PAGE, hi - lo - offset))
+        body = rxiv_page(n, seed=self.seed, cursor=lo + offset, total=hi - lo, server=server, base=self.now, step=self.step)
+        return "application/json", body
+
+    def esearch(self, q: Dict[str, str]) -> Tuple[str, bytes]:
+        lo, hi = self.window(_slashed(q["mindate"]), _slashed(q["maxdate"]))
+        return "application/json", pubmed_esearch(hi - lo, webenv=f"MCID_{lo}_{hi}")
+
+    def efetch(self, q: Dict[str, str]) -> Tuple[str, bytes]:
+        lo, hi = (int(x) for x in q["WebEnv"].split("_")[1:3])
+        start = lo + int(q.get("retstart", 0))
+        n = max(0, min(int(q.get("retmax", 200)), hi - start))
+        return "text/xml", pubmed_efetch(n, seed=self.seed + start, start=start, base=self.now, step=self.step)
+
+    def works(self, q: Dict[str, str]) -> Tuple[str, bytes]:
+        filters = dict(f.split(":", 1) for f in q.get("filter", "").split(",") if ":" in f)
+        lo, hi = self.window(
+            date.fromisoformat(filters.get("from-pub-date", "1970-01-01")),
+            date.fromisoformat(filters.get("until-pub-date", self.now.date().isoformat())),
+        )
+        offset = 0 if q.get("cursor", "*") == "*" else int(q["cursor"])
+        n = max(0, min(int(q.get("rows", 20)), hi - lo - offset))
+        more = offset + n < hi - lo
+        body = crossref_page(
+            n, seed=self.seed + lo + offset, start=lo + offset, next_cursor=str(offset + n) if more else None,
+            total=hi - lo, base=self.now, step=self.step,
+        )
+        return "application/json", body
+
+
+def _slashed(value: str) -> date:
+    return date.fromisoformat(value.replace("/", "-"))
+
+
+class Handler(BaseHTTPRequestHandler):
+    upstream: Upstream
+    verbose = False
+
+    def do_GET(self) -> None:
+        self._handle(parse_qs(urlsplit(self.path).query))
+
+    def do_POST(self) -> None:
+        length = int(self.headers.get("Content-Length") or 0)
+        self._handle(parse_qs(self.rfile.read(length).decode("utf-8")))
+
+    def _handle(self, raw: Dict[str, list]) -> None:
+        up = self.upstream
+        q = {k: v[0] for k, v in raw.items()}
+        path = urlsplit(self.path).path
+        parts = path.strip("/").split("/")
+        if path == "/_stats":
+            return self._send(200, "application/json", json.dumps(dict(up.stats)).encode("utf-8"))
+
+        if up.latency or up.jitter:
+            time.sleep(up.latency + random.uniform(0, up.jitter))
+        endpoint = parts[0] if parts and parts[0] != "entrez" else parts[-1]
+        roll = up.roll()
+        if roll < up.throttle_rate:
+            up.count(f"{endpoint} 429")
+            return self._send(429, "text/plain", b"Too Many Requests", {"Retry-After": f"{up.retry_after:g}"})
+        if roll < up.throttle_rate + up.error_rate:
+            up.count(f"{endpoint} 503")
+            return self._send(503, "text/plain", b"Service Unavailable")
+
+        try:
+            if path == "/api/query":
+                reply = up.arxiv(q)
+            elif parts[0] == "details" and len(parts) == 5:
+                reply = up.rxiv(*parts[1:])
+            elif path.endswith("/esearch.fcgi"):
+                reply = up.esearch(q)
+            elif path.endswith("/efetch.fcgi"):
+                reply = up.efetch(q)
+            elif path == "/works":
+                reply = up.works(q)
+            else:
+                up.count(f"{endpoint} 404")
+                return self._send(404, "text/plain", b"Not Found")
+        except (KeyError, ValueError) as e:
+            up.count(f"{endpoint} 400")
+            return self._send(400, "text/plain", f"Bad request: {e}".encode("utf-8"))
+        up.count(f"{endpoint} 200")
+        self._send(200, *reply)
+
+    def _send(self, status: int, content_type: str, body: bytes, headers: Optional[Dict[str, str]] = None) -> None:
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        for k, v in (headers or {}).items():
+            self.send_header(k, v)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args) -> None:
+        if self.verbose:
+            super().log_message(format, *args)
+
+
+def serve(upstream: Upstream, host: str = "127.0.0.1", port: int = 8750, verbose: bool = False) -> ThreadingHTTPServer:
+    """Start the server on a daemon thread and return it (port 0 picks a free port; see server_address)."""
+    handler = type("MockHandler", (Handler,), {"upstream": upstream, "verbose": verbose})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="mock-upstream", daemon=True).start()
+    return server
+
+
+def main(argv: list) -> int:
+    ap = argparse.ArgumentParser(description=__doc__)
+    ap.add_argument("--host", default="127.0.0.1")
+    ap.add_argument("--port", type=int, default=8750)
+    ap.add_argument("--papers", type=int, default=2000, help="Items per source")
+    ap.add_argument("--days", type=float, default=7, help="The items span this many days back from now")
+    ap.add_argument("--latency", type=float, default=0.0, help="Seconds added to every response")
+    ap.add_argument("--jitter", type=float, default=0.0, help="Up to this many extra seconds, uniformly random")
+    ap.add_argument("--error-rate", type=float, default=0.0, help="Fraction of requests answered with 503")
+    ap.add_argument("--throttle-rate", type=float, default=0.0, help="Fraction of requests answered with 429")
+    ap.add_argument("--retry-after", type=float, default=1.0, help="Retry-After seconds sent with a 429")
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--verbose", action="store_true", help="Log every request")
+    args = ap.parse_args(argv)
+
+    upstream = Upstream(
+        papers=args.papers,
+        days=args.days,
+        latency=args.latency,
+        jitter=args.jitter,
+        error_rate=args.error_rate,
+        throttle_rate=args.throttle_rate,
+        retry_after=args.retry_after,
+        seed=args.seed,
+    )
+    server = serve(upstream, args.host, args.port, args.verbose)
+    host, port = server.server_address[:2]
+    base = f"http://{host}:{port}"
+    print(f"Mock upstream on {base}: {upstream.papers} papers per source over {args.days:g} days")
+    print("Point update_papers.py at it with, in config.yaml:")
+    print("fetch:\n  base_urls: {" + ", ".join(f"{s}: {base}" for s in ("arxiv", "biorxiv", "medrxiv", "pubmed", "chemrxiv")) + "}")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        pass
+    server.shutdown()
+    for key, n in sorted(upstream.stats.items()):
+        print(f"{key:24} {n}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main(sys.argv[1:]))
@@ -0,0 +1,237 @@
+#!/usr/bin/env python3
+"""Offline benchmark suite: fetcher parsing, keyword matching, dedupe, storage and site export."""
+from __future__ import annotations
+
+import argparse
+import json
+import platform
+import shutil
+import sys
+import tempfile
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Tuple
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+import yaml
+
+from benchmarks.fixtures import arxiv_feed, crossref_page, pubmed_efetch, pubmed_esearch, rxiv_page
+from scipaperbot.dedupe import merge_duplicates
+from scipaperbot.fetchers.arxiv import PAGE_SIZE, parse_atom
+from scipaperbot.fetchers.biorxiv import _collapse_versions
+from scipaperbot.fetchers.chemrxiv import ROWS, _parse_work
+from scipaperbot.fetchers.pubmed import EFETCH_BATCH, parse_pubmed_xml
+from scipaperbot.matching import KeywordMatcher, select_matched
+from scipaperbot.models import Paper
+from scipaperbot.site_export import export_site
+from scipaperbot.storage import dedupe_and_sort, load_papers, save_papers
+
+
+# Every benchmark runs on the seeded fixtures in fixtures.py, so nothing touches
+# the network. Parser benchmarks use one API page per source (the page sizes the
+# fetchers request) times --scale; the downstream stages run on a corpus of
+# --papers papers parsed from those fixtures. Each benchmark reports the best of
+# --repeat runs. --json saves the numbers and --compare prints the speedup
+# against an earlier --json file, so a change can be judged on one machine.
+
+RXIV_PAGE = 100  # rows per /details page
+
+
+@dataclass
+class Context:
+    scale: int
+    corpus: List[Paper]
+    keywords: List[str]
+    tmp: Path
+
+
+# A benchmark prepares its input and returns the call to time, plus the number of
+# items and bytes one call processes (0 bytes when throughput in MB/s is meaningless)
+Bench = Tuple[Callable[[], Any], int, int]
+
+
+def load_keywords() -> List[str]:
+    with (ROOT / "config.yaml").open("r", encoding="utf-8") as f:
+        return (yaml.safe_load(f) or {}).get("keywords", [])
+
+
+def build_corpus(n: int, keywords: List[str]) -> List[Paper]:
+    """`n` papers parsed from the fixtures, a quarter per source, with matched keywords filled in."""
+    per = max(1, n // 4)
+    rows = json.loads(rxiv_page(per + per // 4, seed=2))["collection"]
+    papers: List[Paper] = list(parse_atom(arxiv_feed(per, seed=1)))
+    papers += list(_collapse_versions(rows, "bioRxiv"))[:per]
+    papers += list(parse_pubmed_xml(pubmed_efetch(per, seed=3)))
+    papers += [_parse_work(it) for it in json.loads(crossref_page(max(0, n - len(papers)), seed=4))["message"]["items"]]
+    matcher = KeywordMatcher(keywords)
+    for p in papers:
+        p.matched_keywords = matcher.match(p.title, p.summary) or None
+    return papers
+
+
+def parse_arxiv(ctx: Context) -> Bench:
+    n = PAGE_SIZE * ctx.scale
+    data = arxiv_feed(n)
+    return (lambda: list(parse_atom(data))), n, len(data)
+
+
+def parse_biorxiv(ctx: Context) -> Bench:
+    n = RXIV_PAGE * ctx.scale
+    data = rxiv_page(n)
+    return (lambda: list(_collapse_versions(json.loads(data)["collection"], "bioRxiv"))), n, len(data)
+
+
+def parse_pubmed(ctx: Context) -> Bench:
+    n = EFETCH_BATCH * ctx.scale
+    search, data = pubmed_esearch(n), pubmed_efetch(n)
+
+    def run() -> List[Paper]:
+        json.loads(search)["esearchresult"]["count"]
+        return list(parse_pubmed_xml(data))
+
+    return run, n, len(search) + len(data)
+
+
+def parse_chemrxiv(ctx: Context) -> Bench:
+    n = ROWS * ctx.scale
+    data = crossref_page(n)
+    return (lambda: [_parse_work(it) for it in json.loads(data)["message"]["items"]]), n, len(data)
+
+
+def match_keywords(ctx: Context) -> Bench:
+    def run() -> List[List[str]]:
+        # A fresh matcher per run, as update_papers compiles one per keyword list
+        matcher = KeywordMatcher(ctx.keywords)
+        return [matcher.match(p.title, p.summary) for p in ctx.corpus]
+
+    return run, len(ctx.corpus), 0
+
+
+def match_selected(ctx: Context) -> Bench:
+    return (lambda: list(select_matched(KeywordMatcher(ctx.keywords), iter(ctx.corpus)))), len(ctx.corpus), 0
+
+
+def dedupe_sort(ctx: Context) -> Bench:
+    papers = ctx.corpus + ctx.corpus[: len(ctx.corpus) // 5]  # a fifth repeated by id
+    return (lambda: dedupe_and_sort(papers)), len(papers), 0
+
+
+def dedupe_merge(ctx: Context) -> Bench:
+    return (lambda: merge_duplicates(ctx.corpus)), len(ctx.corpus), 0
+
+
+def _stored(ctx: Context, suffix: str) -> Path:
+    path = ctx.tmp / f"papers{suffix}"
+    save_papers(path, ctx.corpus)
+    return path
+
+
+def storage_save(suffix: str) -> Callable[[Context], Bench]:
+    def bench(ctx: Context) -> Bench:
+        path = _stored(ctx, suffix)
+        return (lambda: save_papers(path, ctx.corpus)), len(ctx.corpus), path.stat().st_size
+
+    return bench
+
+
+def storage_load(suffix: str) -> Callable[[Context], Bench]:
+    def bench(ctx: Context) -> Bench:
+        path = _stored(ctx, suffix)
+        return (lambda: load_papers(path)), len(ctx.corpus), path.stat().st_size
+
+    return bench
+
+
+def site_export(ctx: Context) -> Bench:
+    out = ctx.tmp / "site"
+
+    def run() -> Dict[str, Any]:
+        shutil.rmtree(out, ignore_errors=True)  # a cold export: every chunk and shard is written
+        return export_site(ctx.corpus, out)
+
+    return run, len(ctx.corpus), 0
+
+
+BENCHMARKS: Dict[str, Callable[[Context], Bench]] = {
+    "parse.arxiv": parse_arxiv,
+    "parse.biorxiv": parse_biorxiv,
+    "parse.pubmed": parse_pubmed,
+    "parse.chemrxiv": parse_chemrxiv,
+    "match.match_keywords": match_keywords,
+    "match.select_matched": match_selected,
+    "dedupe.dedupe_and_sort": dedupe_sort,
+    "dedupe.merge_duplicates": dedupe_merge,
+    "storage.save_papers.json": storage_save(".json"),
+    "storage.load_papers.json": storage_load(".json"),
+    "storage.save_papers.jsonl": storage_save(".jsonl"),
+    "storage.load_papers.jsonl": storage_load(".jsonl"),
+    "export.export_site": site_export,
+}
+
+
+def best_of(run: Callable[[], Any], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        run()
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def main(argv: list) -> int:
+    ap = argparse.ArgumentParser(description=__doc__)
+    ap.add_argument("--scale", type=int, default=1, help="Multiply the parser fixtures' page sizes")
+    ap.add_argument("--papers", type=int, default=5000, help="Corpus size for matching, dedupe, storage and export")
+    ap.add_argument("--repeat", type=int, default=5)
+    ap.add_argument("--only", nargs="*", default=None, help="Run benchmarks whose name starts with any of these")
+    ap.add_argument("--json", default=None, help="Write the results to this file")
+    ap.add_argument("--compare", default=None, help="Show the speedup against an earlier --json file")
+    args = ap.parse_args(argv)
+
+    names = [n for n in BENCHMARKS if not args.only or any(n.startswith(o) for o in args.only)]
+    baseline: Dict[str, Any] = {}
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            baseline = json.load(f).get("results", {})
+
+    keywords = load_keywords()
+    corpus = build_corpus(args.papers, keywords)
+    print(f"Python {platform.python_version()}, scale {args.scale}, corpus {len(corpus)} papers, best of {args.repeat}")
+    print(f"{'benchmark':28} {'ms':>9} {'items/s':>11} {'MB/s':>8}" + ("  vs baseline" if baseline else ""))
+    results: Dict[str, Dict[str, Any]] = {}
+    with tempfile.TemporaryDirectory(prefix="scipaperbot-bench-") as tmp:
+        for name in names:
+            run, items, nbytes = BENCHMARKS[name](Context(args.scale, corpus, keywords, Path(tmp)))
+            seconds = best_of(run, args.repeat)
+            results[name] = {
+                "seconds": seconds,
+                "items": items,
+                "bytes": nbytes,
+                "items_per_s": items / seconds if seconds else None,
+                "mb_per_s": nbytes / seconds / 1e6 if seconds and nbytes else None,
+            }
+            line = f"{name:28} {seconds * 1000:9.1f} {items / seconds:11,.0f} "
+            line += f"{nbytes / seconds / 1e6:8.1f}" if nbytes else f"{'':8}"
+            if name in baseline:
+                line += f"  {baseline[name]['seconds'] / seconds:6.2f}x"
+            print(line)
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({
+                "python": platform.python_version(),
+                "machine": platform.machine(),
+                "scale": args.scale,
+                "papers": len(corpus),
+                "repeat": args.repeat,
+                "results": results,
+            }, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main(sys.argv[1:]))
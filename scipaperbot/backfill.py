@@ -0,0 +1,115 @@
+from __future__ import annotations
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from scipaperbot.models import Paper
+from scipaperbot.storage import load_papers, save_papers
+
+
+# Historical backfill: split a date range into shards, fetch every (source, shard)
+# pair with a bounded number of workers per source (the transport's per-host rate
+# limits still apply across all of them), and checkpoint each finished shard to its
+# own file so an interrupted backfill resumes where it stopped.
+
+Shard = Tuple[str, str]  # (YYYY-MM-DD, YYYY-MM-DD), both inclusive
+ShardTask = Callable[[str, str, str], Iterable[Paper]]  # (source, start, end) -> matched papers
+
+
+def date_shards(start: date, end: date, shard_days: int = 7) -> List[Shard]:
+    """Split [start, end] into consecutive inclusive ranges of at most `shard_days` days, newest first."""
+    if end < start:
+        raise ValueError(f"Backfill end {end} is before start {start}")
+    shards: List[Shard] = []
+    hi = end
+    step = timedelta(days=max(1, shard_days))
+    while hi >= start:
+        lo = max(start, hi - step + timedelta(days=1))
+        shards.append((lo.isoformat(), hi.isoformat()))
+        hi = lo - timedelta(days=1)
+    return shards
+
+
+@dataclass
+class ShardResult:
+    source: str
+    shard: Shard
+    count: int = 0
+    error: Optional[BaseException] = None
+    skipped: bool = False
+
+
+class Checkpoint:
+    """One JSON file of matched papers per completed (source, shard)."""
+
+    def __init__(self, root: str | Path) -> None:
+        self.root = Path(root)
+
+    def path(self, source: str, shard: Shard) -> Path:
+        return self.root / f"{source}_{shard[0]}_{shard[1]}.json"
+
+    def done(self, source: str, shard: Shard) -> bool:
+        return self.path(source, shard).exists()
+
+    def save(self, source: str, shard: Shard, papers: List[Paper]) -> None:
+        # save_papers writes atomically, so a shard only counts as done once fully written
+        save_papers(self.path(source, shard), papers)
+
+    def load(self, sources: Iterable[str], shards: Iterable[Shard]) -> List[Paper]:
+        papers: List[Paper] = []
+        shards = list(shards)
+        for source in sources:
+            for shard in shards:
+                if self.done(source, shard):
+                    papers.extend(load_papers(self.path(source, shard)))
+        return papers
+
+
+def run_backfill(
+    task: ShardTask,
+    sources: Iterable[str],
+    shards: List[Shard],
+    checkpoint: Checkpoint,
+    workers: Optional[Dict[str, int]] = None,
+    default_workers: int = 2,
+    log: Callable[[str], None] = print,
+) -> List[ShardResult]:
+    """Fetch every pending (source, shard) pair concurrently and checkpoint each on success."""
+    workers = workers or {}
+    sources = list(sources)
+    lock = threading.Lock()
+
+    def one(source: str, shard: Shard) -> ShardResult:
+        t0 = time.monotonic()
+        try:
+            papers = list(task(source, shard[0], shard[1]))
+            checkpoint.save(source, shard, papers)
+        except Exception as e:  # keep going; the shard stays pending for the next run
+            with lock:
+                log(f"[{source}] {shard[0]}..{shard[1]} failed: {e}")
+            return ShardResult(source, shard, error=e)
+        with lock:
+            log(f"[{source}] {shard[0]}..{shard[1]}: {len(papers)} matched in {time.monotonic() - t0:.1f}s")
+        return ShardResult(source, shard, count=len(papers))
+
+    results: List[ShardResult] = []
+    pools = {s: ThreadPoolExecutor(max(1, int(workers.get(s, default_workers))), f"backfill-{s}") for s in sources}
+    try:
+        futures = []
+        for source in sources:
+            for shard in shards:
+                if checkpoint.done(source, shard):
+                    results.append(ShardResult(source, shard, skipped=True))
+                else:
+                    futures.append(pools[source].submit(one, source, shard))
+        for fut in as_completed(futures):
+            results.append(fut.result())
+    finally:
+        for pool in pools.values():
+            pool.shutdown(wait=True, cancel_futures=True)
+    return results
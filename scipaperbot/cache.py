@@ -0,0 +1,272 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Mapping, Optional, Tuple
+from urllib.parse import urlencode
+
+import requests
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+
+# On-disk HTTP response cache used by scipaperbot.transport.
+#
+# Layout under the cache root:
+#   blobs/ab/abcdef...   response bodies, named by the sha256 of their content
+#   meta/12/1234...json  one entry per request (sha256 of method+url+params+body)
+#                        pointing at a blob, plus status, validators and timestamps
+# The meta file's mtime is bumped on every hit and serves as the LRU clock. A blob
+# is deleted once no meta points at it any more (the key was re-stored with another
+# body, or evicted). Eviction runs when the blobs exceed max_bytes and frees space
+# down to EVICT_TO of it, so a full cache is not rescanned on every put.
+
+DEFAULT_TTLS: Dict[str, float] = {
+    "arxiv": 3 * 3600,
+    "biorxiv": 6 * 3600,
+    "medrxiv": 6 * 3600,
+    "pubmed": 3 * 3600,
+    "chemrxiv": 6 * 3600,
+}
+DEFAULT_TTL = 3600.0
+EVICT_TO = 0.9  # fraction of max_bytes left after an eviction
+_KEPT_HEADERS = ("Content-Type", "ETag", "Last-Modified")
+
+
+class OfflineCacheMiss(RuntimeError):
+    """Raised in offline (replay-only) mode when a request has no cached response."""
+
+
+@dataclass
+class CacheEntry:
+    key: str
+    url: str
+    status: int
+    headers: Dict[str, str]
+    blob: str
+    stored_at: float
+    body: bytes
+
+    def age(self) -> float:
+        return time.time() - self.stored_at
+
+    def validators(self) -> Dict[str, str]:
+        v: Dict[str, str] = {}
+        if self.headers.get("ETag"):
+            v["If-None-Match"] = self.headers["ETag"]
+        if self.headers.get("Last-Modified"):
+            v["If-Modified-Since"] = self.headers["Last-Modified"]
+        return v
+
+    def to_response(self) -> requests.Response:
+        r = requests.Response()
+        r.status_code = self.status
+        r.reason = "OK"
+        r.url = self.url
+        r.headers = CaseInsensitiveDict(self.headers)
+        r.encoding = get_encoding_from_headers(r.headers)
+        r._content = self.body
+        r.from_cache = True  # type: ignore[attr-defined]
+        return r
+
+
+def request_key(
+    method: str,
+    url: str,
+    params: Optional[Mapping[str, Any]] = None,
+    data: Optional[Mapping[str, Any]] = None,
+) -> str:
+    h = hashlib.sha256()
+    h.update(method.upper().encode())
+    h.update(b"\0" + url.encode())
+    if params:
+        h.update(b"\0" + urlencode(sorted((str(k), str(v)) for k, v in params.items())).encode())
+    if data:
+        h.update(b"\0" + urlencode(sorted((str(k), str(v)) for k, v in data.items())).encode())
+    return h.hexdigest()
+
+
+class ResponseCache:
+    def __init__(
+        self,
+        root: str | Path,
+        max_bytes: int = 256 * 1024 * 1024,
+        ttls: Optional[Mapping[str, float]] = None,
+        default_ttl: float = DEFAULT_TTL,
+        offline: bool = False,
+    ) -> None:
+        self.root = Path(root)
+        self.max_bytes = int(max_bytes)
+        self.ttls = dict(DEFAULT_TTLS)
+        if ttls:
+            self.ttls.update({k: float(v) for k, v in ttls.items()})
+        self.default_ttl = float(default_ttl)
+        self.offline = offline
+        self._lock = threading.Lock()
+        self._size: Optional[int] = None
+        self._refs: Optional[Dict[str, int]] = None  # metas pointing at each blob
+
+    # -- paths -----------------------------------------------------------
+    def _meta_path(self, key: str) -> Path:
+        return self.root / "meta" / key[:2] / f"{key}.json"
+
+    def _blob_path(self, digest: str) -> Path:
+        return self.root / "blobs" / digest[:2] / digest
+
+    @staticmethod
+    def _write_atomic(path: Path, data: bytes) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        tmp.write_bytes(data)
+        os.replace(tmp, path)
+
+    # -- public API --------------------------------------------------------
+    def ttl(self, source: Optional[str]) -> float:
+        return self.ttls.get(source, self.default_ttl) if source else self.default_ttl
+
+    def get(self, key: str) -> Optional[CacheEntry]:
+        mp = self._meta_path(key)
+        try:
+            meta = json.loads(mp.read_text(encoding="utf-8"))
+            body = self._blob_path(meta["blob"]).read_bytes()
+        except (OSError, ValueError, KeyError):
+            return None
+        try:
+            os.utime(mp)  # LRU clock
+        except OSError:
+            pass
+        return CacheEntry(
+            key=key,
+            url=meta.get("url", ""),
+            status=int(meta.get("status", 200)),
+            headers=dict(meta.get("headers", {})),
+            blob=meta["blob"],
+            stored_at=float(meta.get("stored_at", 0)),
+            body=body,
+        )
+
+    def put(self, key: str, resp: requests.Response, source: Optional[str] = None) -> None:
+        body = resp.content
+        digest = hashlib.sha256(body).hexdigest()
+        meta = {
+            "url": resp.url,
+            "status": resp.status_code,
+            "headers": {h: resp.headers[h] for h in _KEPT_HEADERS if h in resp.headers},
+            "blob": digest,
+            "stored_at": time.time(),
+            "source": source,
+        }
+        mp = self._meta_path(key)
+        with self._lock:
+            if self._refs is None or self._size is None:
+                self._refs = _ref_counts(self._scan_metas())
+                self._size = self._scan_size()
+            previous = _blob_of(mp)
+            bp = self._blob_path(digest)
+            if not bp.exists():
+                self._write_atomic(bp, body)
+                self._size += len(body)
+            self._write_atomic(mp, json.dumps(meta).encode("utf-8"))
+            self._refs[digest] = self._refs.get(digest, 0) + 1
+            if previous is not None:
+                self._release(previous)
+            over = self._size > self.max_bytes
+        if over:
+            self.evict()
+
+    def _release(self, blob: str) -> None:
+        """Drop one reference to `blob`, deleting it when none are left (lock held)."""
+        assert self._refs is not None and self._size is not None
+        left = self._refs.get(blob, 0) - 1
+        if left > 0:
+            self._refs[blob] = left
+            return
+        self._refs.pop(blob, None)
+        bp = self._blob_path(blob)
+        try:
+            self._size -= bp.stat().st_size
+            bp.unlink()
+        except OSError:
+            pass
+
+    def refresh(self, key: str) -> None:
+        """Mark an entry fresh again after a 304 Not Modified revalidation."""
+        mp = self._meta_path(key)
+        try:
+            meta = json.loads(mp.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return
+        meta["stored_at"] = time.time()
+        self._write_atomic(mp, json.dumps(meta).encode("utf-8"))
+
+    def _scan_size(self) -> int:
+        blobs = self.root / "blobs"
+        if not blobs.exists():
+            return 0
+        return sum(p.stat().st_size for p in blobs.glob("*/*"))
+
+    def _scan_metas(self) -> List[Tuple[float, Path, str]]:
+        """(mtime, path, blob) of every meta file, oldest first; unreadable ones are removed."""
+        metas: List[Tuple[float, Path, str]] = []
+        for mp in (self.root / "meta").glob("*/*.json"):
+            try:
+                blob = json.loads(mp.read_text(encoding="utf-8"))["blob"]
+                metas.append((mp.stat().st_mtime, mp, blob))
+            except (OSError, ValueError, KeyError):
+                mp.unlink(missing_ok=True)
+        metas.sort()
+        return metas
+
+    def evict(self) -> None:
+        """Delete unreferenced blobs, then least-recently-used entries until the blobs fit in EVICT_TO of max_bytes."""
+        with self._lock:
+            metas = self._scan_metas()
+            refs = _ref_counts(metas)
+
+            size = 0
+            for bp in (self.root / "blobs").glob("*/*"):
+                if bp.name.startswith("."):
+                    continue  # a put in progress
+                try:
+                    if bp.name in refs:
+                        size += bp.stat().st_size
+                    else:
+                        bp.unlink()
+                except OSError:
+                    pass
+
+            target = self.max_bytes * EVICT_TO
+            for _, mp, blob in metas:
+                if size <= target:
+                    break
+                mp.unlink(missing_ok=True)
+                refs[blob] -= 1
+                if refs[blob] == 0:
+                    del refs[blob]
+                    bp = self._blob_path(blob)
+                    try:
+                        size -= bp.stat().st_size
+                        bp.unlink()
+                    except OSError:
+                        pass
+            self._size = size
+            self._refs = refs
+
+
+def _blob_of(meta_path: Path) -> Optional[str]:
+    try:
+        return json.loads(meta_path.read_text(encoding="utf-8"))["blob"]
+    except (OSError, ValueError, KeyError):
+        return None
+
+
+def _ref_counts(metas: List[Tuple[float, Path, str]]) -> Dict[str, int]:
+    refs: Dict[str, int] = {}
+    for _, _, blob in metas:
+        refs[blob] = refs.get(blob, 0) + 1
+    return refs
@@ -0,0 +1,201 @@
+from __future__ import annotations
+
+import hashlib
+import random
+import re
+import unicodedata
+from collections import defaultdict
+from dataclasses import replace
+from datetime import datetime
+from typing import Dict, FrozenSet, Iterable, List, Optional, Sequence, Tuple
+
+from scipaperbot.models import Paper
+
+
+# Cross-source deduplication. The same work arrives as doi:10.1101/... (bioRxiv),
+# PMID:... (PubMed) and an arXiv abs URL, so ids alone never collide. Each paper is
+# keyed by its normalized DOI, its arXiv id and a MinHash signature of its title
+# shingles; papers sharing a key land in the same hash bucket and are unioned.
+# Title candidates from the LSH buckets are confirmed with an exact Jaccard check,
+# so the work stays near-linear in the number of papers (no pairwise comparison).
+
+SOURCE_PRIORITY = ("PubMed", "bioRxiv", "medRxiv", "ChemRxiv", "arXiv")
+TITLE_THRESHOLD = 0.8  # Jaccard similarity of title shingles to count as the same work
+NUM_PERM = 32
+BANDS = 8  # 8 bands x 4 rows: candidate pairs from roughly 0.6 similarity up
+MIN_SHINGLES = 5  # very short titles ("Editorial") are too generic to match on
+MAX_BUCKET = 64  # larger LSH buckets are generic titles; their members still meet in other bands
+
+_DOI_PREFIX = re.compile(r"^(?:https?://(?:dx\.)?doi\.org/|doi:\s*)", re.I)
+_ARXIV_DOI = re.compile(r"^10\.48550/arxiv\.(.+)$", re.I)
+_ARXIV_ID = re.compile(
+    r"arxiv\.org/(?:abs|pdf)/((?:\d{4}\.\d{4,5})|(?:[a-z\-]+(?:\.[A-Z]{2})?/\d{7}))(?:v\d+)?", re.I
+)
+_ARXIV_BARE = re.compile(r"^(?:arxiv:)?(\d{4}\.\d{4,5}|[a-z\-]+(?:\.[A-Z]{2})?/\d{7})(?:v\d+)?$", re.I)
+_NON_WORD = re.compile(r"[^a-z0-9]+")
+
+_MASK64 = (1 << 64) - 1
+# One odd 64-bit multiplier per MinHash permutation (multiply-shift hashing mod 2**64)
+_rng = random.Random(0x5EED)
+_MULTIPLIERS: Tuple[int, ...] = tuple(_rng.getrandbits(64) | 1 for _ in range(NUM_PERM))
+del _rng
+
+
+def normalize_doi(doi: Optional[str]) -> Optional[str]:
+    """Lowercased bare DOI ('10.xxxx/...') without resolver prefixes, or None."""
+    if not doi:
+        return None
+    d = _DOI_PREFIX.sub("", doi.strip()).strip().rstrip(".").lower()
+    return d if d.startswith("10.") else None
+
+
+def arxiv_id(paper: Paper) -> Optional[str]:
+    """arXiv identifier without version (e.g. '2401.01234'), from the id, link or an arXiv DOI."""
+    for value in (paper.id, paper.link):
+        if value:
+            m = _ARXIV_ID.search(value) or _ARXIV_BARE.match(value.strip())
+            if m:
+                return m.group(1).lower()
+    doi = normalize_doi(paper.doi)
+    if doi:
+        m = _ARXIV_DOI.match(doi)
+        if m:
+            return m.group(1)
+    return None
+
+
+def title_shingles(title: str) -> FrozenSet[str]:
+    """Words and word pairs of the accent-folded, lowercased title, punctuation ignored."""
+    folded = unicodedata.normalize("NFKD", title).encode("ascii", "ignore").decode().lower()
+    words = _NON_WORD.sub(" ", folded).split()
+    return frozenset(words + [f"{a} {b}" for a, b in zip(words, words[1:])])
+
+
+def _hash64(s: str) -> int:
+    return int.from_bytes(hashlib.blake2b(s.encode(), digest_size=8).digest(), "little")
+
+
+def minhash(shingles: Iterable[str]) -> Tuple[int, ...]:
+    hashes = [_hash64(s) for s in shingles]
+    return tuple(min([(a * h) & _MASK64 for h in hashes]) for a in _MULTIPLIERS)
+
+
+def _jaccard(a: FrozenSet[str], b: FrozenSet[str]) -> float:
+    return len(a & b) / len(a | b) if a or b else 0.0
+
+
+class _UnionFind:
+    def __init__(self, n: int) -> None:
+        self.parent = list(range(n))
+
+    def find(self, i: int) -> int:
+        while self.parent[i] != i:
+            self.parent[i] = self.parent[self.parent[i]]
+            i = self.parent[i]
+        return i
+
+    def union(self, i: int, j: int) -> None:
+        ri, rj = self.find(i), self.find(j)
+        if ri != rj:
+            self.parent[max(ri, rj)] = min(ri, rj)
+
+
+def duplicate_groups(papers: Sequence[Paper], title_threshold: float = TITLE_THRESHOLD) -> List[List[int]]:
+    """Indices of `papers` grouped by work (DOI, arXiv id or near-identical title), in input order."""
+    uf = _UnionFind(len(papers))
+    first_by_key: Dict[str, int] = {}
+
+    def link(key: str, i: int) -> None:
+        j = first_by_key.setdefault(key, i)
+        if j != i:
+            uf.union(i, j)
+
+    shingles: List[FrozenSet[str]] = []
+    buckets: Dict[Tuple[int, Tuple[int, ...]], List[int]] = defaultdict(list)
+    rows = NUM_PERM // BANDS
+    for i, p in enumerate(papers):
+        doi = normalize_doi(p.doi)
+        if doi:
+            link(f"doi:{doi}", i)
+        ax = arxiv_id(p)
+        if ax:
+            link(f"arxiv:{ax}", i)
+        sh = title_shingles(p.title)
+        shingles.append(sh)
+        if len(sh) >= MIN_SHINGLES:
+            sig = minhash(sh)
+            for band in range(BANDS):
+                buckets[(band, sig[band * rows : (band + 1) * rows])].append(i)
+
+    for members in buckets.values():
+        if len(members) < 2 or len(members) > MAX_BUCKET:
+            continue
+        # Confirm candidates against one representative per cluster already seen in the bucket
+        reps: List[int] = []
+        for i in members:
+            for r in reps:
+                if uf.find(i) == uf.find(r) or _jaccard(shingles[r], shingles[i]) >= title_threshold:
+                    uf.union(r, i)
+                    break
+            else:
+                reps.append(i)
+
+    groups: Dict[int, List[int]] = defaultdict(list)
+    for i in range(len(papers)):
+        groups[uf.find(i)].append(i)
+    return list(groups.values())
+
+
+def _rank(priority: Sequence[str]):
+    order = {s.lower(): n for n, s in enumerate(priority)}
+
+    def key(p: Paper) -> Tuple[int, int]:
+        return (order.get((p.source or "").lower(), len(order)), -len(p.summary or ""))
+
+    return key
+
+
+def _union(lists: Iterable[Optional[List[str]]]) -> List[str]:
+    return list(dict.fromkeys(x for lst in lists if lst for x in lst))
+
+
+def merge_records(group: Sequence[Paper], priority: Sequence[str] = SOURCE_PRIORITY) -> Paper:
+    """
+    Fold duplicates of one work into a new Paper. The primary record (by source
+    priority, then longest abstract) keeps its id, link, source and date; empty or
+    poorer fields are filled from the others (longest abstract and author list,
+    first DOI, union of categories and matched keywords).
+    """
+    if len(group) == 1:
+        return group[0]
+    ranked = sorted(group, key=_rank(priority))
+    primary = ranked[0]
+    updated = [p.updated for p in group if p.updated]
+    keywords = _union(p.matched_keywords for p in ranked)
+    return replace(
+        primary,
+        title=primary.title or next((p.title for p in ranked if p.title), ""),
+        summary=max((p.summary or "" for p in ranked), key=len),
+        authors=list(max((p.authors for p in ranked), key=len)),
+        doi=primary.doi or next((p.doi for p in ranked if normalize_doi(p.doi)), None),
+        categories=_union(p.categories for p in ranked),
+        primary_category=primary.primary_category or next(
+            (p.primary_category for p in ranked if p.primary_category), None
+        ),
+        updated=max(updated) if updated else None,
+        matched_keywords=keywords or None,
+    )
+
+
+def merge_duplicates(
+    papers: Sequence[Paper],
+    priority: Sequence[str] = SOURCE_PRIORITY,
+    title_threshold: float = TITLE_THRESHOLD,
+) -> List[Paper]:
+    """Collapse cross-source duplicates; returns one merged paper per work, newest first."""
+    merged = [
+        merge_records([papers[i] for i in idx], priority)
+        for idx in duplicate_groups(papers, title_threshold)
+    ]
+    merged.sort(key=lambda p: p.published or datetime.min, reverse=True)
+    return merged
@@ -1,13 +1,14 @@
 from __future__ import annotations
 
+import io
 import re
-from datetime import datetime
-from typing import Iterable, List, Optional
+import xml.etree.ElementTree as ET
+from datetime import datetime, timezone
+from itertools import islice
+from typing import Iterable, Iterator, List, Optional
 from urllib.parse import quote_plus
-import requests
-
-import feedparser
 
+from scipaperbot import transport
 from scipaperbot.models import Paper
 
 
@@ -15,7 +16,12 @@ from scipaperbot.models import Paper
 # arXiv query docs: https://info.arxiv.org/help/api/user-manual.html
 # We'll search in title and abstract for keywords, and optionally filter by categories.
 
-def _build_query(keywords: Iterable[str], categories: Optional[Iterable[str]] = None) -> str:
+def _build_query(
+    keywords: Iterable[str],
+    categories: Optional[Iterable[str]] = None,
+    start_date: Optional[str] = None,  # YYYY-MM-DD
+    end_date: Optional[str] = None,  # YYYY-MM-DD
+) -> str:
     def qval(s: str) -> str:
         s = s.strip()
         # Quote if contains any non-alphanumeric character
@@ -38,90 +44,143 @@ def _build_query(keywords: Iterable[str], categories: Optional[Iterable[str]] =
                 cat_terms.append(f"cat:{c}")
     cat_part = " OR ".join(cat_terms)
 
-    if cat_part:
-        return f"({kw_part}) AND ({cat_part})"
-    return kw_part
+    query = f"({kw_part}) AND ({cat_part})" if cat_part else kw_part
+    if start_date or end_date:
+        lo = start_date.replace("-", "") + "0000" if start_date else "000001010000"
+        hi = end_date.replace("-", "") + "2359" if end_date else "999912312359"
+        query = f"({query}) AND submittedDate:[{lo} TO {hi}]"
+    return query
+
+
+API_URL = "https://export.arxiv.org/api/query"
+PAGE_SIZE = 100
+
+
+_ATOM = "{http://www.w3.org/2005/Atom}"
+_ARXIV = "{http://arxiv.org/schemas/atom}"
+_ENTRY = _ATOM + "entry"
+
+
+def _parse_ts(s: Optional[str]) -> Optional[datetime]:
+    """Parse an RFC 3339 timestamp into naive UTC."""
+    if not s:
+        return None
+    s = s.strip()
+    if s.endswith("Z"):
+        s = s[:-1] + "+00:00"
+    try:
+        dt = datetime.fromisoformat(s)
+    except ValueError:
+        return None
+    if dt.tzinfo is not None:
+        dt = dt.astimezone(timezone.utc).replace(tzinfo=None)
+    return dt
+
+
+def _text(elem: ET.Element, tag: str) -> str:
+    child = elem.find(tag)
+    return (child.text or "") if child is not None else ""
+
+
+def _entry_to_paper(entry: ET.Element) -> Paper:
+    # arXiv id may appear as 'http://arxiv.org/abs/xxxx.yyyyv1'
+    arxiv_id = _text(entry, _ATOM + "id").strip()
+    link = ""
+    fallback = ""
+    for l in entry.iterfind(_ATOM + "link"):
+        rel = l.get("rel", "alternate")
+        if rel == "alternate":
+            link = l.get("href", "")
+            break
+        fallback = fallback or l.get("href", "")
+    if not link:
+        link = fallback or arxiv_id
+
+    authors = [n.text.strip() for n in entry.iterfind(f"{_ATOM}author/{_ATOM}name") if n.text and n.text.strip()]
+    categories = [c.get("term") for c in entry.iterfind(_ATOM + "category") if c.get("term")]
+    primary = entry.find(_ARXIV + "primary_category")
+    published = _parse_ts(_text(entry, _ATOM + "published"))
+
+    return Paper(
+        id=arxiv_id,
+        title=_text(entry, _ATOM + "title").strip(),
+        authors=authors,
+        summary=_text(entry, _ATOM + "summary").strip(),
+        published=published if published else datetime.utcnow(),
+        updated=_parse_ts(_text(entry, _ATOM + "updated")),
+        link=link,
+        categories=categories,
+        source="arXiv",
+        doi=_text(entry, _ARXIV + "doi").strip() or None,
+        primary_category=primary.get("term") if primary is not None else None,
+    )
 
 
-def fetch_arxiv_papers(
+def parse_atom(data: bytes | str) -> Iterator[Paper]:
+    """
+    Incrementally parse an arXiv API Atom feed, yielding one Paper per <entry>.
+    Each entry element is released as soon as it has been converted.
+    """
+    raw = data.encode("utf-8") if isinstance(data, str) else data
+    for _, elem in ET.iterparse(io.BytesIO(raw), events=("end",)):
+        if elem.tag == _ENTRY:
+            yield _entry_to_paper(elem)
+            elem.clear()
+
+
+def iter_arxiv_papers(
     keywords: Iterable[str],
     categories: Optional[Iterable[str]] = None,
-    max_results: int = 100,
-) -> List[Paper]:
+    start_date: Optional[str] = None,  # YYYY-MM-DD
+    end_date: Optional[str] = None,  # YYYY-MM-DD
+    since: Optional[datetime] = None,
+    page_size: int = PAGE_SIZE,
+) -> Iterator[Paper]:
     """
-    Fetch papers from arXiv matching keywords/categories.
-    Note: arXiv API doesn't support arbitrary date range filters; filter dates client-side.
+    Stream papers matching keywords/categories, newest submission first, one page
+    (`start=` offset) at a time. Paging stops once a page reaches entries submitted
+    before `since` (default: start_date) or the result set is exhausted. Only one
+    page is held in memory; the transport spaces requests 3 s apart as arXiv asks.
     """
-    query = _build_query(keywords, categories)
-    base_url = "https://export.arxiv.org/api/query"
-    # Fetch more than needed if possible; caller should filter by date later
-    max_results = max(1, min(300, max_results))
+    query = _build_query(keywords, categories, start_date, end_date)
+    if since is None and start_date:
+        since = datetime.strptime(start_date, "%Y-%m-%d")
+    page_size = max(1, min(2000, page_size))
     enc_query = quote_plus(query)
-    url = (
-        f"{base_url}?search_query={enc_query}&sortBy=submittedDate&sortOrder=descending&max_results={max_results}"
-    )
 
-    headers = {"User-Agent": "scipaperbot/0.1 (+https://github.com/)"}
-    resp = requests.get(url, headers=headers, timeout=30)
-    resp.raise_for_status()
-    feed = feedparser.parse(resp.text)
-    papers: List[Paper] = []
-
-    for entry in feed.entries:
-        # arXiv id may appear as 'http://arxiv.org/abs/xxxx.yyyyv1'
-        arxiv_id = entry.get("id", "")
-        link = ""
-        for l in entry.get("links", []):
-            if l.get("rel") == "alternate":
-                link = l.get("href")
-                break
-        if not link:
-            link = entry.get("link", arxiv_id)
-
-        # parse authors
-        authors = [a.get("name") for a in entry.get("authors", []) if a.get("name")]
-        # categories
-        categories = [t.get("term") for t in entry.get("tags", []) if t.get("term")]
-
-        published_str = entry.get("published")
-        updated_str = entry.get("updated")
-        # arXiv uses RFC3339 / ISO strings; feedparser converts to struct_time too, but keep robust
-        def to_dt(s: Optional[str]) -> Optional[datetime]:
-            if not s:
-                return None
-            # Try feedparser's parsed date
-            if entry.get("published_parsed") and s == published_str:
-                try:
-                    import time
-
-                    return datetime.utcfromtimestamp(time.mktime(entry.published_parsed))
-                except Exception:
-                    pass
-            try:
-                # Remove timezone if present
-                s2 = re.sub(r"[+-]\d{2}:?\d{2}$", "Z", s)
-                return datetime.fromisoformat(s2.replace("Z", "+00:00")).replace(tzinfo=None)
-            except Exception:
-                return None
-
-        published = to_dt(published_str)
-        updated = to_dt(updated_str)
-
-        paper = Paper(
-            id=arxiv_id,
-            title=entry.get("title", "").strip(),
-            authors=authors,
-            summary=entry.get("summary", "").strip(),
-            published=published if published else datetime.utcnow(),
-            updated=updated,
-            link=link,
-            categories=categories,
-            source="arXiv",
-            doi=entry.get("arxiv_doi") if hasattr(entry, "arxiv_doi") else None,
-            primary_category=entry.get("arxiv_primary_category", {}).get("term")
-            if hasattr(entry, "arxiv_primary_category")
-            else None,
+    start = 0
+    while True:
+        url = (
+            f"{API_URL}?search_query={enc_query}&sortBy=submittedDate&sortOrder=descending"
+            f"&start={start}&max_results={page_size}"
         )
-        papers.append(paper)
+        resp = transport.get(url, timeout=30, source="arxiv")
+        resp.raise_for_status()
+        count = 0
+        reached_cutoff = False
+        for paper in parse_atom(resp.content):
+            count += 1
+            if since is not None and paper.published < since:
+                reached_cutoff = True
+            yield paper
+        if reached_cutoff or count < page_size:
+            return
+        start += count
+
 
-    return papers
+def fetch_arxiv_papers(
+    keywords: Iterable[str],
+    categories: Optional[Iterable[str]] = None,
+    max_results: Optional[int] = 100,
+    start_date: Optional[str] = None,  # YYYY-MM-DD
+    end_date: Optional[str] = None,  # YYYY-MM-DD
+) -> List[Paper]:
+    """
+    Fetch papers from arXiv matching keywords/categories.
+    start_date/end_date restrict the query to a submittedDate range; callers should
+    still filter by date client-side. max_results=None pages through every result.
+    """
+    papers = iter_arxiv_papers(keywords, categories, start_date, end_date)
+    if max_results is None:
+        return list(papers)
+    return list(islice(papers, max(1, max_results)))
@@ -1,35 +1,57 @@
 from __future__ import annotations
 
-import requests
 from datetime import datetime
-from typing import List
+from itertools import islice
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
 
+from scipaperbot import transport
 from scipaperbot.models import Paper
 
 API_BASE = "https://api.biorxiv.org"  # supports both biorxiv and medrxiv
 
 
-def _parse_item(it: dict, source_name: str) -> Paper:
+# The /details endpoint returns one row per posted version, each with its own
+# date and abstract, oldest first. Rows are collapsed per DOI while the window is
+# streamed: a row is turned into a Paper only when it is a newer version than any
+# yielded for its DOI, with the earliest row date seen as `published` and its own
+# date as `updated`. A DOI revised within the window is therefore yielded once per
+# version, and the id-keyed archive keeps the last (newest) one. Only the highest
+# version and first date per DOI are remembered, never the rows themselves.
+
+
+def _version(it: dict) -> int:
+    try:
+        return int(it.get("version") or 1)
+    except (TypeError, ValueError):
+        return 1
+
+
+def _date(value: Optional[str]) -> Optional[datetime]:
+    try:
+        return datetime.strptime(value or "", "%Y-%m-%d")  # YYYY-MM-DD
+    except ValueError:
+        return None
+
+
+def _parse_item(it: dict, source_name: str, first_date: Optional[datetime] = None) -> Paper:
     doi = it.get("doi")
     title = (it.get("title") or "").strip()
     # authors string: "Last, First; Last, First"
     authors_str = it.get("authors") or ""
     authors = [a.strip() for a in authors_str.split(";") if a.strip()]
-    date_str = it.get("date")  # YYYY-MM-DD
-    try:
-        published = datetime.strptime(date_str, "%Y-%m-%d")
-    except Exception:
-        published = datetime.utcnow()
-    link = f"https://www.biorxiv.org/content/{doi}v1" if source_name == "bioRxiv" else f"https://www.medrxiv.org/content/{doi}v1"
+    posted = _date(it.get("date")) or datetime.utcnow()
+    published = min(first_date, posted) if first_date else posted
+    host = "www.biorxiv.org" if source_name == "bioRxiv" else "www.medrxiv.org"
+    link = f"https://{host}/content/{doi}v{_version(it)}"
     # Some DOIs in bio/medrxiv are like 10.1101/2024.01.23.12...
 
     return Paper(
         id=f"doi:{doi}" if doi else link,
         title=title,
         authors=authors,
-        summary="",  # API endpoint used does not include abstract; can be added with per-DOI call if needed
+        summary=" ".join((it.get("abstract") or "").split()),
         published=published,
-        updated=None,
+        updated=posted if posted > published else None,
         link=link,
         categories=[],
         source=source_name,
@@ -38,30 +60,87 @@ def _parse_item(it: dict, source_name: str) -> Paper:
     )
 
 
-def fetch_rxiv(
+def _collapse_versions(items: Iterable[dict], source_name: str) -> Iterator[Paper]:
+    """Yield a Paper for each row that is a newer version of its DOI (rows without a DOI pass straight through)."""
+    seen: Dict[str, Tuple[int, Optional[datetime]]] = {}  # doi -> (highest version yielded, first date)
+    for it in items:
+        doi = (it.get("doi") or "").strip().lower()
+        if not doi:
+            yield _parse_item(it, source_name)
+            continue
+        version = _version(it)
+        posted = _date(it.get("date"))
+        best, first = seen.get(doi, (0, None))
+        if posted and (first is None or posted < first):
+            first = posted
+        if version > best:
+            seen[doi] = (version, first)
+            yield _parse_item(it, source_name, first)
+        else:
+            seen[doi] = (best, first)
+
+
+def iter_rxiv(
     server: str,  # 'biorxiv' or 'medrxiv'
     start_date: str,  # YYYY-MM-DD
     end_date: str,  # YYYY-MM-DD
-    max_results: int = 100,
-) -> List[Paper]:
+    categories: Optional[Iterable[str]] = None,
+) -> Iterator[Paper]:
+    """
+    Stream every preprint posted in the window, one API page at a time.
+    The `/details` cursor is a record offset and pages hold up to 100 records, so
+    the cursor advances by the page length until the reported total is reached.
+    With `categories` (e.g. "cell biology"), only those subject collections are
+    scanned, one `?category=` walk per subject. Papers are yielded as each page
+    arrives; a DOI revised within the window is yielded again for each newer
+    version, which supersedes the earlier one by id.
+    """
     assert server in ("biorxiv", "medrxiv")
     url = f"{API_BASE}/details/{server}/{start_date}/{end_date}"
-    papers: List[Paper] = []
-    cursor = 0
-    headers = {"User-Agent": "scipaperbot/0.1 (+https://github.com/)"}
-
-    while len(papers) < max_results:
-        page_url = f"{url}/{cursor}"
-        resp = requests.get(page_url, headers=headers, timeout=30)
-        resp.raise_for_status()
-        data = resp.json()
-        items = data.get("collection", [])
-        if not items:
-            break
-        for it in items:
-            papers.append(_parse_item(it, "bioRxiv" if server == "biorxiv" else "medRxiv"))
-            if len(papers) >= max_results:
-                break
-        cursor += 1
-
-    return papers
+    source_name = "bioRxiv" if server == "biorxiv" else "medRxiv"
+    subjects: List[Optional[str]] = [c.strip().lower().replace(" ", "_") for c in categories or [] if c.strip()]
+
+    def rows() -> Iterator[dict]:
+        for subject in subjects or [None]:
+            params = {"category": subject} if subject else None
+            cursor = 0
+            while True:
+                resp = transport.get(f"{url}/{cursor}", params=params, timeout=30, source=server)
+                resp.raise_for_status()
+                data = resp.json()
+                items = data.get("collection", [])
+                if not items:
+                    break
+                yield from items
+                cursor += len(items)
+                total = _total(data)
+                if total is not None and cursor >= total:
+                    break
+
+    yield from _collapse_versions(rows(), source_name)
+
+
+def _total(data: dict) -> Optional[int]:
+    for msg in data.get("messages", []) or []:
+        try:
+            return int(msg.get("total"))
+        except (TypeError, ValueError):
+            continue
+    return None
+
+
+def fetch_rxiv(
+    server: str,  # 'biorxiv' or 'medrxiv'
+    start_date: str,  # YYYY-MM-DD
+    end_date: str,  # YYYY-MM-DD
+    max_results: Optional[int] = 100,
+    categories: Optional[Iterable[str]] = None,
+) -> List[Paper]:
+    """
+    Collect `iter_rxiv` into a list, stopping after `max_results` papers (None = whole
+    window). Each id appears once, as its newest version.
+    """
+    papers = iter_rxiv(server, start_date, end_date, categories=categories)
+    if max_results is not None:
+        papers = islice(papers, max(0, max_results))
+    return list({p.id: p for p in papers}.values())
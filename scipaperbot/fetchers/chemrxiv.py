@@ -1,75 +1,116 @@
 from __future__ import annotations
 
+import html
+import re
 from datetime import datetime
-from typing import Iterable, List
-
-import requests
+from itertools import islice
+from typing import Iterable, Iterator, List, Optional, Set
 
+from scipaperbot import transport
 from scipaperbot.models import Paper
 
 CROSSREF = "https://api.crossref.org/works"
 CHEMRXIV_PREFIX = "10.26434"  # DOI prefix for ChemRxiv
+ROWS = 1000  # Crossref's maximum page size
+# Only the fields _parse_work reads; keeps each page a fraction of the full record size
+SELECT = "DOI,title,author,abstract,URL,published-print,published-online,created,deposited"
 
+_TAG = re.compile(r"<[^>]+>")
+_SPACE = re.compile(r"\s+")
 
-def fetch_chemrxiv(
+
+def _strip_jats(s: str) -> str:
+    # Crossref abstracts are JATS XML fragments (<jats:p>...</jats:p>). Unescape before
+    # stripping, so escaped markup in the text (&lt;img ...&gt;) is removed too rather
+    # than turned back into live tags.
+    return _SPACE.sub(" ", _TAG.sub(" ", html.unescape(s))).strip()
+
+
+def _parse_work(it: dict) -> Paper:
+    doi = it.get("DOI")
+    title_list = it.get("title", [])
+    title = (title_list[0] if title_list else "").strip()
+    authors = []
+    for a in it.get("author", []) or []:
+        given = a.get("given") or ""
+        family = a.get("family") or ""
+        nm = (given + " " + family).strip()
+        if nm:
+            authors.append(nm)
+    # published date parts
+    dt = datetime.utcnow()
+    for fld in ("published-print", "published-online", "created", "deposited"):
+        if it.get(fld, {}).get("date-parts"):
+            ymd = it[fld]["date-parts"][0]
+            # date-parts may be [YYYY, M, D]
+            try:
+                y = ymd[0]; m = ymd[1] if len(ymd) > 1 else 1; d = ymd[2] if len(ymd) > 2 else 1
+                dt = datetime(int(y), int(m), int(d))
+                break
+            except Exception:
+                pass
+    url = it.get("URL") or (f"https://doi.org/{doi}" if doi else "")
+    return Paper(
+        id=f"doi:{doi}" if doi else url,
+        title=title,
+        authors=authors,
+        summary=_strip_jats(it.get("abstract") or ""),
+        published=dt,
+        updated=None,
+        link=url,
+        categories=[],
+        source="ChemRxiv",
+        doi=doi,
+    )
+
+
+def iter_chemrxiv(
     keywords: Iterable[str],
     start_date: str,  # YYYY-MM-DD
     end_date: str,  # YYYY-MM-DD
-    max_results: int = 100,
-) -> List[Paper]:
-    headers = {"User-Agent": "scipaperbot/0.1 (+https://github.com/)"}
-    papers: List[Paper] = []
-    for kw in keywords:
-        if len(papers) >= max_results:
-            break
-        params = {
-            "rows": str(max(1, min(100, max_results - len(papers)))) ,
-            "query": kw,
-            "filter": f"from-pub-date:{start_date},until-pub-date:{end_date},prefix:{CHEMRXIV_PREFIX}",
-            "sort": "published",
-            "order": "desc",
-        }
-        r = requests.get(CROSSREF, params=params, headers=headers, timeout=30)
+    rows: int = ROWS,
+) -> Iterator[Paper]:
+    """
+    Stream ChemRxiv works in the date window that mention any keyword. All keywords
+    go into one Crossref query, which is walked with deep-paging cursors (`cursor=*`,
+    then `next-cursor`) and a `select=` field projection; DOIs already yielded are skipped.
+    """
+    terms = list(dict.fromkeys(k.strip() for k in keywords if k.strip()))
+    params = {
+        "rows": str(max(1, min(ROWS, rows))),
+        "filter": f"from-pub-date:{start_date},until-pub-date:{end_date},prefix:{CHEMRXIV_PREFIX}",
+        "select": SELECT,
+        "sort": "published",
+        "order": "desc",
+        "cursor": "*",
+    }
+    if terms:
+        params["query"] = " ".join(terms)
+
+    seen: Set[str] = set()
+    while True:
+        r = transport.get(CROSSREF, params=params, timeout=60, source="chemrxiv")
         r.raise_for_status()
-        items = r.json().get("message", {}).get("items", [])
+        message = r.json().get("message", {})
+        items = message.get("items", [])
         for it in items:
-            doi = it.get("DOI")
-            title_list = it.get("title", [])
-            title = (title_list[0] if title_list else "").strip()
-            authors = []
-            for a in it.get("author", []) or []:
-                given = a.get("given") or ""
-                family = a.get("family") or ""
-                nm = (given + " " + family).strip()
-                if nm:
-                    authors.append(nm)
-            # published date parts
-            dt = datetime.utcnow()
-            for fld in ("published-print", "published-online", "created", "deposited"):
-                if it.get(fld, {}).get("date-parts"):
-                    ymd = it[fld]["date-parts"][0]
-                    # date-parts may be [YYYY, M, D]
-                    try:
-                        y = ymd[0]; m = ymd[1] if len(ymd) > 1 else 1; d = ymd[2] if len(ymd) > 2 else 1
-                        dt = datetime(int(y), int(m), int(d))
-                        break
-                    except Exception:
-                        pass
-            url = it.get("URL") or (f"https://doi.org/{doi}" if doi else "")
-            papers.append(
-                Paper(
-                    id=f"doi:{doi}" if doi else url,
-                    title=title,
-                    authors=authors,
-                    summary="",
-                    published=dt,
-                    updated=None,
-                    link=url,
-                    categories=[],
-                    source="ChemRxiv",
-                    doi=doi,
-                )
-            )
-            if len(papers) >= max_results:
-                break
-    return papers
+            key = (it.get("DOI") or "").lower()
+            if key in seen:
+                continue
+            if key:
+                seen.add(key)
+            yield _parse_work(it)
+        next_cursor = message.get("next-cursor")
+        if not items or not next_cursor or len(items) < int(params["rows"]):
+            return
+        params["cursor"] = next_cursor
+
+
+def fetch_chemrxiv(
+    keywords: Iterable[str],
+    start_date: str,  # YYYY-MM-DD
+    end_date: str,  # YYYY-MM-DD
+    max_results: Optional[int] = 100,
+) -> List[Paper]:
+    papers = iter_chemrxiv(keywords, start_date, end_date)
+    return list(papers) if max_results is None else list(islice(papers, max_results))
@@ -1,14 +1,25 @@
 from __future__ import annotations
 
+import io
 import os
-from datetime import datetime
-from typing import Iterable, List, Optional
-
-import requests
+import time
+import xml.etree.ElementTree as ET
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import date, datetime, timedelta
+from itertools import islice
+from typing import Any, Callable, Deque, Dict, Iterable, Iterator, List, Optional
 
+from scipaperbot import metrics, transport
 from scipaperbot.models import Paper
 
 EUTILS = "https://eutils.ncbi.nlm.nih.gov/entrez/eutils"
+EFETCH_BATCH = 200  # PMIDs per EFetch POST
+ESEARCH_LIMIT = 10000  # PubMed only pages through the first 10,000 hits of a search
+
+_MONTHS = {m: i for i, m in enumerate(
+    ("jan", "feb", "mar", "apr", "may", "jun", "jul", "aug", "sep", "oct", "nov", "dec"), start=1
+)}
 
 
 def _build_term(keywords: Iterable[str]) -> str:
@@ -23,83 +34,262 @@ def _build_term(keywords: Iterable[str]) -> str:
     return " OR ".join(terms) if terms else "aging[Title/Abstract]"
 
 
-def fetch_pubmed(
-    keywords: Iterable[str],
-    start_date: str,  # YYYY-MM-DD
-    end_date: str,  # YYYY-MM-DD
-    max_results: int = 100,
-    email: Optional[str] = None,
-) -> List[Paper]:
-    tool = "scipaperbot"
-    email = email or os.getenv("PUBMED_EMAIL") or "you@example.com"
-    term = _build_term(keywords)
+def _month(value: str) -> int:
+    v = value.strip().lower()
+    if v.isdigit():
+        return int(v)
+    return _MONTHS.get(v[:3], 1)
+
+
+def _pub_date(article: ET.Element) -> Optional[datetime]:
+    """Journal issue date (what ESummary reports as `pubdate`), else the electronic ArticleDate."""
+    pd = article.find("Journal/JournalIssue/PubDate")
+    if pd is not None:
+        year = pd.findtext("Year")
+        if not year:
+            # e.g. <MedlineDate>2025 Nov-Dec</MedlineDate>
+            parts = (pd.findtext("MedlineDate") or "").split()
+            year = parts[0] if parts and parts[0].isdigit() else None
+            month = _month(parts[1].split("-")[0]) if len(parts) > 1 else 1
+            day = 1
+        else:
+            month = _month(pd.findtext("Month") or "1")
+            day_s = pd.findtext("Day") or "1"
+            day = int(day_s) if day_s.isdigit() else 1
+        if year:
+            try:
+                return datetime(int(year), month, day)
+            except ValueError:
+                pass
+    ad = article.find("ArticleDate")
+    if ad is not None:
+        try:
+            return datetime(int(ad.findtext("Year")), int(ad.findtext("Month")), int(ad.findtext("Day")))
+        except (TypeError, ValueError):
+            pass
+    return None
+
+
+def _entrez_date(elem: ET.Element) -> Optional[datetime]:
+    """Date the record entered PubMed (its Entrez date, what ESearch `edat` windows on)."""
+    for d in elem.iterfind("PubmedData/History/PubMedPubDate"):
+        if d.get("PubStatus") != "entrez":
+            continue
+        try:
+            return datetime(
+                int(d.findtext("Year")), int(d.findtext("Month")), int(d.findtext("Day")),
+                int(d.findtext("Hour") or 0), int(d.findtext("Minute") or 0),
+            )
+        except (TypeError, ValueError):
+            return None
+    return None
+
+
+def _article_to_paper(elem: ET.Element) -> Optional[Paper]:
+    citation = elem.find("MedlineCitation")
+    if citation is None:
+        return None
+    pmid = (citation.findtext("PMID") or "").strip()
+    article = citation.find("Article")
+    if not pmid or article is None:
+        return None
+
+    title_el = article.find("ArticleTitle")
+    title = "".join(title_el.itertext()).strip() if title_el is not None else ""
+
+    sections = []
+    for ab in article.iterfind("Abstract/AbstractText"):
+        text = "".join(ab.itertext()).strip()
+        if not text:
+            continue
+        label = ab.get("Label")
+        sections.append(f"{label}: {text}" if label else text)
+
+    authors = []
+    for a in article.iterfind("AuthorList/Author"):
+        last = a.findtext("LastName")
+        if last:
+            initials = a.findtext("Initials") or ""
+            authors.append(f"{last} {initials}".strip())
+        elif a.findtext("CollectiveName"):
+            authors.append(a.findtext("CollectiveName").strip())
 
-    # ESearch to get PMIDs
-    params = {
+    doi = None
+    for aid in elem.iterfind("PubmedData/ArticleIdList/ArticleId"):
+        if aid.get("IdType") == "doi" and aid.text:
+            doi = aid.text.strip()
+            break
+    if doi is None:
+        for loc in article.iterfind("ELocationID"):
+            if loc.get("EIdType") == "doi" and loc.text:
+                doi = loc.text.strip()
+                break
+
+    return Paper(
+        id=f"PMID:{pmid}",
+        title=title,
+        authors=authors,
+        summary="\n".join(sections),
+        published=_pub_date(article) or datetime.utcnow(),
+        # The Entrez date: PubMed windows and watermarks run on it, not on the issue date
+        updated=_entrez_date(elem),
+        link=f"https://pubmed.ncbi.nlm.nih.gov/{pmid}/",
+        categories=[],
+        source="PubMed",
+        doi=doi,
+    )
+
+
+def parse_pubmed_xml(data: bytes) -> Iterator[Paper]:
+    """
+    Incrementally parse an EFetch PubmedArticleSet, yielding one Paper per article.
+    EFetch reports failures such as an expired WebEnv as HTTP 200 with an <ERROR>
+    element; that raises RuntimeError instead of reading as an empty batch.
+    """
+    for _, elem in ET.iterparse(io.BytesIO(data), events=("end",)):
+        if elem.tag == "ERROR":
+            raise RuntimeError(f"PubMed EFetch error: {(elem.text or '').strip()}")
+        if elem.tag == "PubmedArticle":
+            paper = _article_to_paper(elem)
+            if paper is not None:
+                yield paper
+            elem.clear()
+
+
+def _esearch(term: str, start_date: str, end_date: str, common: Dict[str, str]) -> Dict[str, Any]:
+    """
+    ESearch with usehistory=y: the hits stay on the history server for EFetch.
+    The window is on the Entrez date (when the record was added to PubMed) rather
+    than the publication date, which is often the print issue date and can lie
+    weeks before a record is indexed.
+    """
+    data = {
         "db": "pubmed",
         "term": term,
         "retmode": "json",
-        "retmax": str(max_results),
-        "sort": "pub+date",
-        "mindate": start_date,
-        "maxdate": end_date,
-        "datetype": "pdat",
-        "tool": tool,
-        "email": email,
+        "retmax": "0",
+        "usehistory": "y",
+        "sort": "pub_date",
+        "mindate": start_date.replace("-", "/"),
+        "maxdate": end_date.replace("-", "/"),
+        "datetype": "edat",
+        **common,
     }
-    r = requests.get(f"{EUTILS}/esearch.fcgi", params=params, timeout=30)
+    # The WebEnv in the reply expires with its NCBI history session: never reuse a cached one
+    r = transport.post(f"{EUTILS}/esearch.fcgi", data=data, timeout=30, source="pubmed", reuse=False)
     r.raise_for_status()
-    ids = r.json().get("esearchresult", {}).get("idlist", [])
-    if not ids:
-        return []
+    return r.json().get("esearchresult", {})
+
 
-    # ESummary to get details
-    params2 = {
+def _efetch(webenv: str, query_key: str, retstart: int, retmax: int, common: Dict[str, str]) -> bytes:
+    data = {
         "db": "pubmed",
-        "id": ",".join(ids),
-        "retmode": "json",
-        "tool": tool,
-        "email": email,
+        "WebEnv": webenv,
+        "query_key": query_key,
+        "retstart": str(retstart),
+        "retmax": str(retmax),
+        "retmode": "xml",
+        "rettype": "abstract",
+        **common,
     }
-    r2 = requests.get(f"{EUTILS}/esummary.fcgi", params=params2, timeout=30)
-    r2.raise_for_status()
-    data = r2.json()
-    result = data.get("result", {})
-
-    papers: List[Paper] = []
-    for pmid in ids:
-        rec = result.get(pmid)
-        if not rec:
-            continue
-        title = (rec.get("title") or "").strip()
-        authors = [a.get("name") for a in rec.get("authors", []) if a.get("name")]
-        pubdate = (rec.get("pubdate") or "").strip()  # often '2025 Nov 6'
-        # Try to parse pubdate leniently
-        dt = None
-        for fmt in ("%Y %b %d", "%Y %b", "%Y"):
-            try:
-                dt = datetime.strptime(pubdate, fmt)
-                break
-            except Exception:
-                continue
-        if not dt:
-            try:
-                dt = datetime.strptime(pubdate, "%Y-%m-%d")
-            except Exception:
-                dt = datetime.utcnow()
-        link = f"https://pubmed.ncbi.nlm.nih.gov/{pmid}/"
-        papers.append(
-            Paper(
-                id=f"PMID:{pmid}",
-                title=title,
-                authors=authors,
-                summary="",  # ESummary doesn’t return abstract
-                published=dt,
-                updated=None,
-                link=link,
-                categories=[],
-                source="PubMed",
-                doi=None,
-            )
-        )
-    return papers
+    r = transport.post(f"{EUTILS}/efetch.fcgi", data=data, timeout=60, source="pubmed", reuse=False)
+    r.raise_for_status()
+    return r.content
+
+
+def _efetch_batches(
+    term: str,
+    start: date,
+    end: date,
+    common: Dict[str, str],
+    batch_size: int,
+    budget: List[Optional[int]],
+) -> Iterator[Callable[[], bytes]]:
+    """
+    Lazily run ESearch over [start, end] and yield one zero-argument EFetch call per
+    batch of hits. A window with more hits than ESearch/EFetch can page through is
+    bisected by date until every piece fits. `budget` holds the remaining
+    max_results (None = unlimited) and is shared across the recursion.
+    """
+    if budget[0] is not None and budget[0] <= 0:
+        return
+    res = _esearch(term, start.isoformat(), end.isoformat(), common)
+    count = int(res.get("count", 0) or 0)
+    if count > ESEARCH_LIMIT and end > start:
+        mid = start + (end - start) // 2
+        # Newest half first, matching the pub_date sort within each window
+        yield from _efetch_batches(term, mid + timedelta(days=1), end, common, batch_size, budget)
+        yield from _efetch_batches(term, start, mid, common, batch_size, budget)
+        return
+
+    webenv, query_key = res.get("webenv"), res.get("querykey")
+    total = min(count, ESEARCH_LIMIT)
+    if budget[0] is not None:
+        total = min(total, budget[0])
+        budget[0] -= total
+    if not total or not webenv or not query_key:
+        return
+    for retstart in range(0, total, batch_size):
+        n = min(batch_size, total - retstart)
+        yield lambda retstart=retstart, n=n: _efetch(webenv, query_key, retstart, n, common)
+
+
+def iter_pubmed(
+    keywords: Iterable[str],
+    start_date: str,  # YYYY-MM-DD
+    end_date: str,  # YYYY-MM-DD
+    max_results: Optional[int] = None,
+    email: Optional[str] = None,
+    batch_size: int = EFETCH_BATCH,
+    prefetch: int = 2,
+) -> Iterator[Paper]:
+    """
+    Stream PubMed records (with abstracts) matching the keywords that were added to
+    PubMed within the date window. Each ESearch leaves its result set on the E-utilities history server;
+    EFetch then POSTs for `batch_size` records at a time by WebEnv/query_key.
+
+    Requests are pipelined: up to `prefetch` EFetch batches are in flight on worker
+    threads while earlier batches are parsed and the next ESearch window is
+    requested, so the search and detail round trips overlap.
+    """
+    common = {"tool": "scipaperbot", "email": email or os.getenv("PUBMED_EMAIL") or "you@example.com"}
+    api_key = os.getenv("NCBI_API_KEY")
+    if api_key:
+        common["api_key"] = api_key
+
+    batches = _efetch_batches(
+        _build_term(keywords),
+        datetime.strptime(start_date, "%Y-%m-%d").date(),
+        datetime.strptime(end_date, "%Y-%m-%d").date(),
+        common,
+        batch_size,
+        [max_results],
+    )
+
+    def result(fut: Future) -> bytes:
+        # The EFetch ran on a worker thread; count the wait for it as this thread's network time
+        t0 = time.perf_counter()
+        try:
+            return fut.result()
+        finally:
+            metrics.waited(time.perf_counter() - t0)
+
+    with ThreadPoolExecutor(max(1, prefetch), thread_name_prefix="efetch") as pool:
+        in_flight: Deque[Future] = deque()
+        for call in batches:
+            in_flight.append(pool.submit(call))
+            if len(in_flight) > prefetch:
+                yield from parse_pubmed_xml(result(in_flight.popleft()))
+        while in_flight:
+            yield from parse_pubmed_xml(result(in_flight.popleft()))
+
+
+def fetch_pubmed(
+    keywords: Iterable[str],
+    start_date: str,  # YYYY-MM-DD
+    end_date: str,  # YYYY-MM-DD
+    max_results: Optional[int] = 100,
+    email: Optional[str] = None,
+) -> List[Paper]:
+    papers = iter_pubmed(keywords, start_date, end_date, max_results=max_results, email=email)
+    return list(papers) if max_results is None else list(islice(papers, max_results))
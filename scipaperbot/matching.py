@@ -0,0 +1,282 @@
+from __future__ import annotations
+
+import re
+from concurrent.futures import Executor, ProcessPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime
+from itertools import compress, islice
+from typing import Callable, Dict, FrozenSet, Iterable, Iterator, List, Optional, Pattern, Sequence, Tuple
+
+from scipaperbot.models import Paper
+
+
+# Keyword matching rules, compiled once per keyword list.
+#
+# Every rule is expressed over a small set of "atoms" (aging terms, DDR terms,
+# "dna damage", "repair" and one whole-phrase atom per plain keyword). Each atom
+# has a few lowercase literals, one of which must occur in any text it matches;
+# the atom's regex only runs when a cheap substring check on the lowercased text
+# finds one, which rules out most atoms for most abstracts. The keyword rules are
+# plain set checks.
+
+_ATOM_AGING = "aging"
+_ATOM_DDR = "ddr"
+_ATOM_DNA_DAMAGE = "dna_damage"
+_ATOM_REPAIR = "repair"
+
+_SPECIAL_ATOMS: Dict[str, str] = {
+    _ATOM_AGING: r"\baging\b|\bageing\b|\bsenescent\b|\bsenescence\b",
+    _ATOM_DDR: r"\bddr\b|\bdna\s+damage\s+response\b",
+    _ATOM_DNA_DAMAGE: r"\bdna\s+damage\b",
+    _ATOM_REPAIR: r"\brepair\b",
+}
+
+_SPECIAL_LITERALS: Dict[str, Tuple[str, ...]] = {
+    _ATOM_AGING: ("aging", "ageing", "senescen"),
+    _ATOM_DDR: ("ddr", "dna"),
+    _ATOM_DNA_DAMAGE: ("dna",),
+    _ATOM_REPAIR: ("repair",),
+}
+
+# 'dna' as a whole ASCII-letter token of the lowercased text (only needed as a fallback)
+_DNA_WORD = re.compile(r"(?<![a-zA-Z])dna(?![a-zA-Z])")
+
+Rule = Callable[[FrozenSet[str], str], bool]
+
+_BIO_TOKENS = frozenset({
+    "dna", "rna", "protein", "proteins", "gene", "genes", "genome", "genomic", "genetics",
+    "cell", "cells", "cellular", "tissue", "organism", "mouse", "mice", "human", "yeast", "bacteria",
+    "mitochondria", "chromatin", "chromosome", "repair", "biological",
+})
+_WORDS = re.compile(r"[a-zA-Z]+")
+
+
+def is_bio_context(text: str) -> bool:
+    """Heuristic: require at least one biological token in text."""
+    return not _BIO_TOKENS.isdisjoint(_WORDS.findall(text.lower()))
+
+
+def _rule_for(kl: str) -> Tuple[Rule, Tuple[str, ...]]:
+    """Return (rule, atoms it depends on) for a stripped, lowercased keyword."""
+    if kl in {"ageing", "aging"}:
+        return (lambda atoms, text: _ATOM_AGING in atoms), (_ATOM_AGING,)
+
+    if kl in {"ddr", "dna damage response"}:
+        return (lambda atoms, text: _ATOM_DDR in atoms), (_ATOM_DDR,)
+
+    if kl in {"dna damage", "damage repair"}:
+        # Require presence of key tokens
+        def dna_damage_or_repair(atoms: FrozenSet[str], text: str) -> bool:
+            if _ATOM_DNA_DAMAGE in atoms:
+                return True
+            return _ATOM_REPAIR in atoms and _DNA_WORD.search(text.lower()) is not None
+
+        return dna_damage_or_repair, (_ATOM_DNA_DAMAGE, _ATOM_REPAIR)
+
+    if "dna damage" in kl and "repair" in kl:
+        # For 'DNA damage and Repair' / 'DNA damage & Repair'
+        return (lambda atoms, text: _ATOM_DNA_DAMAGE in atoms and _ATOM_REPAIR in atoms), (
+            _ATOM_DNA_DAMAGE,
+            _ATOM_REPAIR,
+        )
+
+    # Default: whole-phrase word-boundary match
+    atom = f"phrase:{kl}"
+    return (lambda atoms, text: atom in atoms), (atom,)
+
+
+class KeywordMatcher:
+    """
+    Biology-oriented, word-boundary aware keyword matcher.
+    - Uses word boundaries to avoid false positives (e.g., 'PAge' != 'aging').
+    - Handles combined phrases like 'DNA damage & Repair' by requiring key tokens.
+    - Supports DDR as acronym or 'dna damage response'.
+    Build it once per keyword list; `match` then prefilters the atoms on literal
+    substrings and only runs the regexes of those that can occur.
+    """
+
+    def __init__(self, keywords: Iterable[str]) -> None:
+        self.keywords: List[str] = list(keywords)
+        self._rules: List[Tuple[str, Rule]] = []
+        atom_sources: Dict[str, Tuple[str, Tuple[str, ...]]] = {}
+
+        for kw in self.keywords:
+            k = kw.strip()
+            if not k:
+                continue
+            kl = k.lower()
+            rule, atoms = _rule_for(kl)
+            self._rules.append((kw, rule))
+            for atom in atoms:
+                if atom in _SPECIAL_ATOMS:
+                    atom_sources[atom] = (_SPECIAL_ATOMS[atom], _SPECIAL_LITERALS[atom])
+                else:
+                    atom_sources[atom] = (r"\b" + re.escape(kl) + r"\b", (kl,))
+
+        self._atoms: List[Tuple[str, Tuple[str, ...], Pattern[str]]] = [
+            (name, literals, re.compile(src, re.I)) for name, (src, literals) in atom_sources.items()
+        ]
+
+    def __reduce__(self):
+        return (KeywordMatcher, (self.keywords,))
+
+    def atoms(self, text: str) -> FrozenSet[str]:
+        """Names of all atoms occurring anywhere in `text`."""
+        low = text.lower()
+        return frozenset(
+            name
+            for name, literals, pat in self._atoms
+            if any(lit in low for lit in literals) and pat.search(text)
+        )
+
+    def match_text(self, text: str) -> List[str]:
+        atoms = self.atoms(text)
+        if not atoms:
+            return []
+        return [kw for kw, rule in self._rules if rule(atoms, text)]
+
+    def match(self, title: str, summary: str) -> List[str]:
+        return self.match_text(f"{title}\n{summary}")
+
+    # -- batch API ---------------------------------------------------------
+    @property
+    def rule_keywords(self) -> List[str]:
+        """Keyword behind each bit of a mask (bit i <-> rule_keywords[i])."""
+        return [kw for kw, _ in self._rules]
+
+    def mask(self, text: str) -> int:
+        """Bitmask of the keyword rules matching `text`."""
+        atoms = self.atoms(text)
+        if not atoms:
+            return 0
+        m = 0
+        for i, (_, rule) in enumerate(self._rules):
+            if rule(atoms, text):
+                m |= 1 << i
+        return m
+
+    def masks(self, texts: Iterable[str]) -> List[int]:
+        return [self.mask(t) for t in texts]
+
+    def match_many(
+        self,
+        papers: Iterable[Paper],
+        chunk_size: int = 1000,
+        processes: Optional[int] = None,
+        bio: bool = False,
+        pool: Optional[Executor] = None,
+    ) -> "BatchMatch":
+        """
+        Match a list or stream of papers. Texts are processed `chunk_size` at a time;
+        with `processes` > 1 the chunks are spread over a process pool (worth it
+        for large backfills only), or over `pool` (from `matcher_pool`) when given.
+        With `bio`, the biology-context flag is computed too.
+        """
+        papers = papers if isinstance(papers, Sequence) else list(papers)
+        texts = [f"{p.title}\n{p.summary}" for p in papers]
+        chunks = [texts[i : i + chunk_size] for i in range(0, len(texts), chunk_size)]
+        if pool is None and processes and processes > 1 and len(chunks) > 1:
+            with matcher_pool(self, processes) as own:
+                return self._match_chunks(chunks, bio, own)
+        return self._match_chunks(chunks, bio, pool)
+
+    def _match_chunks(self, chunks: List[List[str]], bio: bool, pool: Optional[Executor]) -> "BatchMatch":
+        masks: List[int] = []
+        flags: Optional[List[bool]] = [] if bio else None
+        if pool is not None:
+            results: Iterable[Tuple[List[int], List[bool]]] = pool.map(_worker_chunk, chunks, [bio] * len(chunks))
+        else:
+            results = (_chunk(self, chunk, bio) for chunk in chunks)
+        for chunk_masks, chunk_flags in results:
+            masks.extend(chunk_masks)
+            if flags is not None:
+                flags.extend(chunk_flags)
+        return BatchMatch(keywords=self.rule_keywords, masks=masks, bio=flags)
+
+
+@dataclass
+class BatchMatch:
+    """Match results for many papers: one keyword bitmask (and optional bio flag) per paper."""
+
+    keywords: List[str]
+    masks: List[int]
+    bio: Optional[List[bool]] = None
+    _decoded: Dict[int, List[str]] = field(default_factory=dict, repr=False)
+
+    def __len__(self) -> int:
+        return len(self.masks)
+
+    def keywords_for_mask(self, mask: int) -> List[str]:
+        # Few distinct masks occur in practice, so decode each one once
+        kws = self._decoded.get(mask)
+        if kws is None:
+            kws = self._decoded[mask] = [kw for i, kw in enumerate(self.keywords) if mask >> i & 1]
+        return kws
+
+    def keywords_for(self, index: int) -> List[str]:
+        return self.keywords_for_mask(self.masks[index])
+
+    def selection(self, require_bio: bool = False) -> List[bool]:
+        """Per-paper keep flags: matched at least one keyword (and bio context when required)."""
+        if require_bio and self.bio is not None:
+            return [bool(m) and b for m, b in zip(self.masks, self.bio)]
+        return [bool(m) for m in self.masks]
+
+
+def _chunk(matcher: KeywordMatcher, texts: List[str], bio: bool) -> Tuple[List[int], List[bool]]:
+    return matcher.masks(texts), ([is_bio_context(t) for t in texts] if bio else [])
+
+
+_worker_matcher: Optional[KeywordMatcher] = None
+
+
+def _init_worker(matcher: KeywordMatcher) -> None:
+    global _worker_matcher
+    _worker_matcher = matcher
+
+
+def _worker_chunk(texts: List[str], bio: bool) -> Tuple[List[int], List[bool]]:
+    assert _worker_matcher is not None
+    return _chunk(_worker_matcher, texts, bio)
+
+
+def matcher_pool(matcher: KeywordMatcher, processes: int) -> ProcessPoolExecutor:
+    """A process pool whose workers match with `matcher`; pass it to `match_many` / `select_matched`."""
+    return ProcessPoolExecutor(processes, initializer=_init_worker, initargs=(matcher,))
+
+
+def select_matched(
+    matcher: KeywordMatcher,
+    papers: Iterable[Paper],
+    since: Optional[datetime] = None,
+    require_bio: bool = False,
+    chunk_size: int = 1000,
+    processes: Optional[int] = None,
+    pool: Optional[Executor] = None,
+) -> Iterator[Paper]:
+    """
+    Stream `papers` through the matcher chunk by chunk: drop papers older than
+    `since`, match the rest in bulk, apply the optional bio-context gate and set
+    `matched_keywords` on the papers that are kept.
+
+    With `processes` > 1, `processes` chunks are read at a time and matched in
+    parallel on one process pool kept for the whole stream (or on `pool`, which
+    must come from `matcher_pool` for the same matcher).
+    """
+    processes = max(1, processes or 1)
+    if processes > 1 and pool is None:
+        with matcher_pool(matcher, processes) as own:
+            yield from select_matched(matcher, papers, since, require_bio, chunk_size, processes, own)
+        return
+    batch = chunk_size * processes
+    it = iter(papers)
+    while True:
+        chunk = list(islice(it, batch))
+        if not chunk:
+            return
+        if since is not None:
+            chunk = list(compress(chunk, [p.published >= since for p in chunk]))
+        result = matcher.match_many(chunk, chunk_size=chunk_size, bio=require_bio, pool=pool)
+        for p, mask in compress(zip(chunk, result.masks), result.selection(require_bio)):
+            p.matched_keywords = list(result.keywords_for_mask(mask))
+            yield p
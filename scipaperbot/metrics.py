@@ -0,0 +1,205 @@
+from __future__ import annotations
+
+import json
+import sys
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, Optional, TypeVar
+
+from scipaperbot.models import ISO_FMT
+from scipaperbot.storage import atomic_write
+
+try:  # not available on Windows; peak RSS is then left out
+    import resource
+except ImportError:  # pragma: no cover
+    resource = None
+
+
+# Per-run instrumentation. Everything is recorded in one process-wide registry
+# (guarded by a lock, since sources are fetched on worker threads):
+#   - stages: wall and CPU seconds of named steps (`with stage("dedupe"):`). CPU time
+#     is the calling thread's, so a stage run on a fetch thread is not charged for
+#     the others.
+#   - per-source counters (`count("pubmed", "requests")`): transport records
+#     requests, response bytes, retries, cache hits and seconds spent on HTTP (on
+#     every thread, so prefetching sources can exceed their wall time);
+#     update_papers records papers fetched, matched and kept, the seconds spent
+#     pulling papers from the fetcher and how much of that the consuming thread
+#     was blocked on the network; the orchestrator times each source as stage
+#     `fetch:<source>`.
+#   - per-thread network wait (`waited(seconds)`): transport adds each request's
+#     time, and a fetcher that hands requests to worker threads adds the time spent
+#     waiting for their results, so `timed_iter` can tell waiting from parsing.
+# `report()` turns the registry into the JSON run report; `prometheus()` renders
+# the same numbers in the node_exporter textfile format.
+
+T = TypeVar("T")
+
+_lock = threading.Lock()
+_stages: Dict[str, Dict[str, float]] = {}
+_counters: Dict[str, Dict[str, float]] = defaultdict(lambda: defaultdict(float))
+_started = time.time()
+_thread = threading.local()
+
+
+def reset() -> None:
+    """Forget everything recorded so far and restart the run clock."""
+    global _started
+    with _lock:
+        _stages.clear()
+        _counters.clear()
+        _started = time.time()
+
+
+def add_stage(name: str, wall: float, cpu: float = 0.0) -> None:
+    with _lock:
+        s = _stages.setdefault(name, {"wall_seconds": 0.0, "cpu_seconds": 0.0, "calls": 0})
+        s["wall_seconds"] += wall
+        s["cpu_seconds"] += cpu
+        s["calls"] += 1
+
+
+@contextmanager
+def stage(name: str) -> Iterator[None]:
+    """Time the enclosed block as stage `name` (repeated stages accumulate)."""
+    wall0, cpu0 = time.perf_counter(), time.thread_time()
+    try:
+        yield
+    finally:
+        add_stage(name, time.perf_counter() - wall0, time.thread_time() - cpu0)
+
+
+def count(source: Optional[str], name: str, value: float = 1) -> None:
+    """Add `value` to counter `name` of `source` (None is recorded as "other")."""
+    with _lock:
+        _counters[source or "other"][name] += value
+
+
+def waited(seconds: float) -> None:
+    """Add `seconds` the current thread spent blocked on the network."""
+    _thread.wait = thread_wait() + seconds
+
+
+def thread_wait() -> float:
+    """Seconds the current thread has spent blocked on the network so far."""
+    return getattr(_thread, "wait", 0.0)
+
+
+def timed_iter(source: str, name: str, items: Iterable[T], wait: Optional[str] = None) -> Iterator[T]:
+    """
+    Pass `items` through, adding the seconds spent waiting on the upstream iterator
+    to counter `name`, and with `wait`, the part of them this thread was blocked on
+    the network (see `waited`) to counter `wait`.
+    """
+    it = iter(items)
+    spent = 0.0
+    blocked = 0.0
+    try:
+        while True:
+            t0, w0 = time.perf_counter(), thread_wait()
+            try:
+                item = next(it)
+            except StopIteration:
+                return
+            finally:
+                spent += time.perf_counter() - t0
+                blocked += thread_wait() - w0
+            yield item
+    finally:
+        count(source, name, spent)
+        if wait is not None:
+            count(source, wait, blocked)
+
+
+def peak_rss_bytes() -> Optional[int]:
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS bytes
+    return int(peak) if sys.platform == "darwin" else int(peak) * 1024
+
+
+def report() -> Dict[str, Any]:
+    """The run so far as a JSON-serializable dict."""
+    with _lock:
+        stages = {name: dict(s) for name, s in _stages.items()}
+        sources = {src: dict(c) for src, c in sorted(_counters.items())}
+    for src, c in sources.items():
+        if "fetch_seconds" in c:
+            # Time pulling papers from the fetcher minus the time that thread was
+            # blocked on the network = parsing; the rest of the source's fetch stage
+            # went to keyword matching
+            c["parse_seconds"] = max(0.0, c["fetch_seconds"] - c.get("wait_seconds", 0.0))
+            if f"fetch:{src}" in stages:
+                c["match_seconds"] = max(0.0, stages[f"fetch:{src}"]["wall_seconds"] - c["fetch_seconds"])
+        for key, value in c.items():
+            if key.endswith("_seconds"):
+                c[key] = round(value, 6)
+            elif isinstance(value, float) and value.is_integer():
+                c[key] = int(value)
+    for s in stages.values():
+        s["wall_seconds"] = round(s["wall_seconds"], 6)
+        s["cpu_seconds"] = round(s["cpu_seconds"], 6)
+    return {
+        "started": datetime.fromtimestamp(_started, timezone.utc).strftime(ISO_FMT),
+        "wall_seconds": round(time.time() - _started, 3),
+        "cpu_seconds": round(time.process_time(), 3),
+        "peak_rss_bytes": peak_rss_bytes(),
+        "stages": stages,
+        "sources": sources,
+    }
+
+
+def _num(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+def _label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def prometheus(rep: Dict[str, Any], prefix: str = "scipaperbot") -> str:
+    """Render a `report()` dict in the Prometheus text exposition format."""
+    lines = []
+
+    def metric(name: str, kind: str, samples: Iterable[tuple]) -> None:
+        samples = list(samples)
+        if not samples:
+            return
+        lines.append(f"# TYPE {prefix}_{name} {kind}")
+        for labels, value in samples:
+            tags = ",".join(f'{k}="{_label(str(v))}"' for k, v in labels.items())
+            lines.append(f"{prefix}_{name}{{{tags}}} {_num(value)}" if tags else f"{prefix}_{name} {_num(value)}")
+
+    metric("run_wall_seconds", "gauge", [({}, rep["wall_seconds"])])
+    metric("run_cpu_seconds", "gauge", [({}, rep["cpu_seconds"])])
+    if rep.get("peak_rss_bytes") is not None:
+        metric("peak_rss_bytes", "gauge", [({}, rep["peak_rss_bytes"])])
+    metric("run_timestamp_seconds", "gauge", [({}, time.time())])
+    stages = rep["stages"]
+    metric("stage_wall_seconds", "gauge", [({"stage": n}, s["wall_seconds"]) for n, s in stages.items()])
+    metric("stage_cpu_seconds", "gauge", [({"stage": n}, s["cpu_seconds"]) for n, s in stages.items()])
+    names = sorted({k for c in rep["sources"].values() for k in c})
+    for key in names:
+        metric(
+            f"source_{key}",
+            "gauge",
+            [({"source": src}, c[key]) for src, c in rep["sources"].items() if key in c],
+        )
+    return "\n".join(lines) + "\n"
+
+
+def write_report(path: str | Path, rep: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    rep = rep if rep is not None else report()
+    atomic_write(Path(path), lambda f: json.dump(rep, f, indent=2))
+    return rep
+
+
+def write_prometheus(path: str | Path, rep: Optional[Dict[str, Any]] = None) -> None:
+    # Written atomically, so the textfile collector never reads a partial file
+    text = prometheus(rep if rep is not None else report())
+    atomic_write(Path(path), lambda f: f.write(text))
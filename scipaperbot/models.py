@@ -1,14 +1,35 @@
 from __future__ import annotations
 
-from dataclasses import dataclass, asdict
+import sys
+from dataclasses import dataclass
 from datetime import datetime
+from functools import lru_cache
 from typing import List, Optional, Dict, Any
 
 
 ISO_FMT = "%Y-%m-%dT%H:%M:%SZ"
 
 
-@dataclass
+# Most papers share a handful of publication dates, so formatted and parsed
+# timestamps are memoized (datetimes are immutable and safe to share).
+@lru_cache(maxsize=8192)
+def format_ts(dt: datetime) -> str:
+    return dt.strftime(ISO_FMT)
+
+
+@lru_cache(maxsize=8192)
+def parse_ts(value: str) -> datetime:
+    if len(value) == 20 and value[-1] == "Z":
+        # Fast path for ISO_FMT; fromisoformat is far cheaper than strptime
+        return datetime.fromisoformat(value[:-1])
+    return datetime.strptime(value, ISO_FMT)
+
+
+def _interned(values: Any) -> List[str]:
+    return [sys.intern(v) for v in values]
+
+
+@dataclass(slots=True)
 class Paper:
     id: str
     title: str
@@ -24,26 +45,39 @@ class Paper:
     matched_keywords: Optional[List[str]] = None
 
     def to_dict(self) -> Dict[str, Any]:
-        d = asdict(self)
-        d["published"] = self.published.strftime(ISO_FMT)
-        d["updated"] = self.updated.strftime(ISO_FMT) if self.updated else None
-        return d
+        return {
+            "id": self.id,
+            "title": self.title,
+            "authors": list(self.authors),
+            "summary": self.summary,
+            "published": format_ts(self.published),
+            "updated": format_ts(self.updated) if self.updated else None,
+            "link": self.link,
+            "categories": list(self.categories),
+            "source": self.source,
+            "doi": self.doi,
+            "primary_category": self.primary_category,
+            "matched_keywords": list(self.matched_keywords) if self.matched_keywords is not None else None,
+        }
 
     @staticmethod
     def from_dict(d: Dict[str, Any]) -> "Paper":
         pub = d.get("published")
         upd = d.get("updated")
+        primary = d.get("primary_category")
+        keywords = d.get("matched_keywords")
         return Paper(
             id=d["id"],
             title=d["title"],
             authors=list(d.get("authors", [])),
             summary=d.get("summary", ""),
-            published=datetime.strptime(pub, ISO_FMT) if isinstance(pub, str) else pub,
-            updated=datetime.strptime(upd, ISO_FMT) if isinstance(upd, str) and upd else None,
+            published=parse_ts(pub) if isinstance(pub, str) else pub,
+            updated=parse_ts(upd) if isinstance(upd, str) and upd else None,
             link=d.get("link", ""),
-            categories=list(d.get("categories", [])),
-            source=d.get("source", "arXiv"),
+            # Sources, categories and keywords repeat across the archive; share one copy of each
+            categories=_interned(d.get("categories", [])),
+            source=sys.intern(d.get("source", "arXiv")),
             doi=d.get("doi"),
-            primary_category=d.get("primary_category"),
-            matched_keywords=list(d.get("matched_keywords", [])) if d.get("matched_keywords") else None,
+            primary_category=sys.intern(primary) if primary else primary,
+            matched_keywords=_interned(keywords) if keywords else None,
         )
@@ -0,0 +1,76 @@
+from __future__ import annotations
+
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Iterable, List, Optional
+
+from scipaperbot import metrics
+from scipaperbot.models import Paper
+
+
+# Fetch all enabled sources at the same time. Each source runs in its own daemon
+# thread so a hung upstream can neither block the others nor keep the process alive
+# after the deadline; failures are captured per source instead of aborting the run.
+
+FetchTask = Callable[[], Iterable[Paper]]
+
+
+@dataclass
+class SourceResult:
+    name: str
+    papers: List[Paper] = field(default_factory=list)
+    error: Optional[BaseException] = None
+    elapsed: float = 0.0
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+def _run_task(name: str, fn: FetchTask, out: Dict[str, SourceResult]) -> None:
+    t0 = time.monotonic()
+    try:
+        with metrics.stage(f"fetch:{name}"):
+            papers = list(fn())
+        out[name] = SourceResult(name=name, papers=papers, elapsed=time.monotonic() - t0)
+    except Exception as e:  # isolate failures per source
+        out[name] = SourceResult(name=name, error=e, elapsed=time.monotonic() - t0)
+
+
+def fetch_all(
+    tasks: Dict[str, FetchTask],
+    timeout: Optional[float] = None,
+    timeouts: Optional[Dict[str, float]] = None,
+) -> Dict[str, SourceResult]:
+    """
+    Run every fetch task concurrently and collect one SourceResult per task.
+    `timeout` is the default per-source deadline in seconds (None = wait forever);
+    `timeouts` overrides it for individual sources. Results keep the order of `tasks`.
+    """
+    timeouts = timeouts or {}
+    done: Dict[str, SourceResult] = {}
+    threads: Dict[str, threading.Thread] = {}
+    started = time.monotonic()
+
+    for name, fn in tasks.items():
+        t = threading.Thread(target=_run_task, args=(name, fn, done), name=f"fetch-{name}", daemon=True)
+        threads[name] = t
+        t.start()
+
+    results: Dict[str, SourceResult] = {}
+    for name, t in threads.items():
+        limit = timeouts.get(name, timeout)
+        if limit is None:
+            t.join()
+        else:
+            t.join(max(0.0, limit - (time.monotonic() - started)))
+        if t.is_alive():
+            results[name] = SourceResult(
+                name=name,
+                error=TimeoutError(f"{name} did not finish within {limit:g}s"),
+                elapsed=time.monotonic() - started,
+            )
+        else:
+            results[name] = done[name]
+    return results
@@ -0,0 +1,130 @@
+from __future__ import annotations
+
+import json
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+from scipaperbot.dedupe import normalize_doi
+from scipaperbot.models import Paper, format_ts, parse_ts
+from scipaperbot.storage import append_records, iter_records, save_records
+
+
+# Ledger of papers already posted to Twitter (data/posted_log.jsonl), one JSON
+# line per post: {"id": ..., "keys": [...], "posted": ..., "published": ...}. The keys
+# are the paper id and its canonical DOI, so the same work arriving from another
+# source (a bioRxiv DOI id, a PubMed record carrying that DOI) counts as posted.
+# Every key maps to its post time in memory, so membership is one dict lookup.
+# Posts are appended and fsynced one by one. An entry expires one TTL after the
+# later of its post time and the paper's publication date (PubMed print dates can
+# lie in the future, and a paper stays eligible while it is inside the posting
+# window); expired entries are dropped by an atomic rewrite. A corrupt line raises
+# instead of silently emptying the ledger, which would re-post everything; only a
+# torn last line from an interrupted append is skipped. A missing ledger is
+# written at once, importing the old posted_ids.json list when there is one.
+
+LEDGER_PATH = "data/posted_log.jsonl"
+LEGACY_PATH = "data/posted_ids.json"
+TTL_DAYS = 30
+
+
+def paper_keys(paper_id: str, doi: Optional[str] = None) -> List[str]:
+    """Ledger keys of a paper: its id and, when it has one, its canonical DOI."""
+    keys = [f"id:{paper_id}"]
+    canonical = normalize_doi(doi) or normalize_doi(paper_id)  # "doi:10.1101/..." ids carry it
+    if canonical:
+        keys.append(f"doi:{canonical}")
+    return keys
+
+
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc).replace(tzinfo=None, microsecond=0)
+
+
+class PostedLedger:
+    def __init__(
+        self,
+        path: str | Path = LEDGER_PATH,
+        ttl_days: Optional[float] = TTL_DAYS,
+        legacy_path: Optional[str | Path] = LEGACY_PATH,
+    ) -> None:
+        self.path = Path(path)
+        self.ttl = timedelta(days=ttl_days) if ttl_days is not None else None
+        self._entries: List[Dict[str, Any]] = []
+        self._keys: Dict[str, datetime] = {}
+        if self.path.exists():
+            for d in iter_records(self.path):
+                self._index(d)
+        else:
+            if legacy_path is not None and Path(legacy_path).exists():
+                self._import_legacy(Path(legacy_path))
+            self._rewrite(self._entries)  # the file always exists once a ledger was opened
+
+    def _index(self, d: Dict[str, Any]) -> None:
+        when = parse_ts(d["posted"])
+        self._entries.append(d)
+        for key in d["keys"]:
+            if key not in self._keys or self._keys[key] < when:
+                self._keys[key] = when
+
+    def _import_legacy(self, path: Path) -> None:
+        with path.open("r", encoding="utf-8") as f:
+            ids = json.load(f)  # a corrupt file raises: better no run than a re-post of everything
+        # Post times were never recorded; count them from now so they expire one TTL later
+        stamp = format_ts(_utcnow())
+        for pid in ids:
+            self._index({"id": pid, "keys": paper_keys(pid), "posted": stamp})
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, paper: Paper) -> bool:
+        return any(key in self._keys for key in paper_keys(paper.id, paper.doi))
+
+    def ids(self) -> Set[str]:
+        return {d["id"] for d in self._entries}
+
+    def unposted(self, papers: Iterable[Paper]) -> Iterable[Paper]:
+        """Papers not in the ledger, skipping repeats of one work (same id or DOI) within `papers`."""
+        seen: Set[str] = set()
+        for p in papers:
+            keys = paper_keys(p.id, p.doi)
+            if any(k in self._keys or k in seen for k in keys):
+                continue
+            seen.update(keys)
+            yield p
+
+    def add(self, paper: Paper, when: Optional[datetime] = None) -> None:
+        """Record `paper` as posted and append it to the ledger file at once."""
+        d = {
+            "id": paper.id,
+            "keys": paper_keys(paper.id, paper.doi),
+            "posted": format_ts(when or _utcnow()),
+            "published": format_ts(paper.published),
+        }
+        append_records(self.path, [d])
+        self._index(d)
+
+    def compact(self, now: Optional[datetime] = None) -> int:
+        """Drop entries expired for the TTL (rewriting the file atomically); returns the number dropped."""
+        if self.ttl is None:
+            return 0
+        cutoff = (now or _utcnow()) - self.ttl
+        keep = [d for d in self._entries if _expiry_base(d) >= cutoff]
+        dropped = len(self._entries) - len(keep)
+        if dropped:
+            self._rewrite(keep)
+        self._entries, self._keys = [], {}
+        for d in keep:
+            self._index(d)
+        return dropped
+
+    def _rewrite(self, entries: List[Dict[str, Any]]) -> None:
+        save_records(self.path, entries)
+
+
+def _expiry_base(d: Dict[str, Any]) -> datetime:
+    """The later of post time and publication date: the TTL counts from here."""
+    posted = parse_ts(d["posted"])
+    published = parse_ts(d["published"]) if d.get("published") else None
+    return max(posted, published) if published is not None else posted
@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+import base64
+import re
+import unicodedata
+from collections import defaultdict
+from typing import Dict, Iterable, List, Sequence
+
+from scipaperbot.models import Paper
+
+
+# Inverted index for the static site's search box. Papers are numbered by doc id,
+# counted from the oldest paper (so ids stay put as new papers are added); each
+# token maps to the ascending list of doc ids containing it, delta-encoded. The
+# postings are sharded by the token's first two characters so the page only
+# fetches the shards its query needs. Keyword and source facets are bitmaps over
+# doc ids. site/app.js tokenizes queries exactly like `tokenize` below.
+
+PREFIX_LEN = 2
+MIN_TOKEN_LEN = 2
+STOPWORDS = frozenset({
+    "a", "an", "and", "are", "as", "at", "be", "by", "for", "from", "in", "into", "is", "it",
+    "its", "of", "on", "or", "that", "the", "these", "this", "to", "was", "we", "were", "which", "with",
+})
+_TOKEN = re.compile(r"[a-z0-9]+")
+
+
+def tokenize(text: str) -> List[str]:
+    """Accent-folded, lowercased alphanumeric tokens (stopwords and 1-char tokens dropped)."""
+    folded = "".join(c for c in unicodedata.normalize("NFKD", text) if not unicodedata.combining(c)).lower()
+    return [t for t in _TOKEN.findall(folded) if len(t) >= MIN_TOKEN_LEN and t not in STOPWORDS]
+
+
+def build_postings(papers: Sequence[Paper]) -> Dict[str, List[int]]:
+    """token -> ascending doc ids, where doc id i is papers[i] (papers ordered oldest first)."""
+    postings: Dict[str, List[int]] = defaultdict(list)
+    for doc, p in enumerate(papers):
+        for token in set(tokenize(f"{p.title}\n{p.summary}")):
+            postings[token].append(doc)
+    return postings
+
+
+def delta_encode(ids: Iterable[int]) -> List[int]:
+    out: List[int] = []
+    prev = 0
+    for i in ids:
+        out.append(i - prev)
+        prev = i
+    return out
+
+
+def shard_postings(postings: Dict[str, List[int]]) -> Dict[str, Dict[str, List[int]]]:
+    """Group delta-encoded postings by token prefix."""
+    shards: Dict[str, Dict[str, List[int]]] = defaultdict(dict)
+    for token in sorted(postings):
+        shards[token[:PREFIX_LEN]][token] = delta_encode(postings[token])
+    return shards
+
+
+def bitmap(ids: Iterable[int], size: int) -> str:
+    """Base64 little-endian bitmap (bit i = doc id i), padded to whole 32-bit words."""
+    buf = bytearray(((size + 31) // 32) * 4)
+    for i in ids:
+        buf[i >> 3] |= 1 << (i & 7)
+    return base64.b64encode(bytes(buf)).decode("ascii")
+
+
+def build_facets(papers: Sequence[Paper]) -> Dict[str, Dict[str, str]]:
+    keywords: Dict[str, List[int]] = defaultdict(list)
+    sources: Dict[str, List[int]] = defaultdict(list)
+    for doc, p in enumerate(papers):
+        for k in p.matched_keywords or []:
+            keywords[k].append(doc)
+        if p.source:
+            sources[p.source].append(doc)
+    n = len(papers)
+    return {
+        "keywords": {k: bitmap(ids, n) for k, ids in sorted(keywords.items())},
+        "sources": {s: bitmap(ids, n) for s, ids in sorted(sources.items())},
+    }
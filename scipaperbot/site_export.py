@@ -0,0 +1,247 @@
+from __future__ import annotations
+
+import gzip
+import hashlib
+import json
+from datetime import datetime, timezone
+from itertools import groupby
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+from scipaperbot.models import ISO_FMT, Paper, format_ts
+from scipaperbot.search_index import MIN_TOKEN_LEN, PREFIX_LEN, STOPWORDS, build_facets, build_postings, shard_postings
+from scipaperbot.storage import atomic_write
+
+try:  # optional: brotli siblings next to the gzip ones
+    import brotli
+except ImportError:  # pragma: no cover
+    brotli = None
+
+
+# Sharded export for the static site. Papers are grouped by publication month and
+# each month is cut into chunks of at most `chunk_size` (counted from its oldest
+# paper), so a daily run only rewrites the newest chunk or two. Every chunk is
+# written to data/chunks/ under a name derived from its content hash: its URL
+# changes whenever its content does, and the files can be cached forever. A small
+# manifest.json (fetched fresh on each visit) lists the chunks newest first with
+# the keyword/source facets, so the page renders the first chunk immediately and
+# fetches the rest as the user scrolls. The search index (see search_index.py) is
+# written the same way under data/search/.
+#
+# Chunks hold minified listing records (only what a card renders, abstract cut to
+# SUMMARY_CHARS); full records can go to optional per-paper detail files. Every
+# file can get precompressed .gz/.br siblings for hosts that serve them directly.
+
+MANIFEST = "manifest.json"
+CHUNK_DIR = "chunks"
+SEARCH_DIR = "search"
+DETAIL_DIR = "details"
+CHUNK_SIZE = 500
+SUMMARY_CHARS = 240  # what a card shows; the rest is in the detail file
+CARD_AUTHORS = 5
+
+
+def _compact(obj: Any) -> str:
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":"))
+
+
+def _load(path: Path) -> Any:
+    try:
+        with path.open("r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+class _Writer:
+    """Atomic file writes under one directory, each optionally with .gz/.br siblings."""
+
+    def __init__(self, out_dir: Path, compress: bool) -> None:
+        self.out_dir = out_dir
+        self.compress = compress
+
+    def text(self, name: str, text: str) -> None:
+        path = self.out_dir / name
+        data = text.encode("utf-8")
+        atomic_write(path, lambda f: f.write(data), binary=True)
+        if not self.compress:
+            return
+        gz = gzip.compress(data, compresslevel=9, mtime=0)
+        atomic_write(path.with_name(path.name + ".gz"), lambda f: f.write(gz), binary=True)
+        if brotli is not None:
+            br = brotli.compress(data, quality=11)
+            atomic_write(path.with_name(path.name + ".br"), lambda f: f.write(br), binary=True)
+
+    def hashed(self, stem: str, text: str) -> str:
+        """Write `text` to `<stem>-<hash>.json` (once) and return its relative name."""
+        digest = hashlib.sha256(text.encode("utf-8")).hexdigest()[:16]
+        name = f"{stem}-{digest}.json"
+        if not (self.out_dir / name).exists():  # same hash, same bytes
+            self.text(name, text)
+        return name
+
+
+def referenced_files(out_dir: Path) -> Set[str]:
+    """Every content-hashed chunk and search file the current manifest under `out_dir` points at."""
+    manifest = _load(out_dir / MANIFEST)
+    if not isinstance(manifest, dict):
+        return set()
+    files = {c["file"] for c in manifest.get("chunks", []) if "file" in c}
+    search = manifest.get("search") or {}
+    for key in ("shards", "facets"):
+        if search.get(key):
+            files.add(search[key])
+    table = _load(out_dir / search["shards"]) if search.get("shards") else None
+    if isinstance(table, dict):
+        files.update(table.values())
+    return files
+
+
+def _details_in(out_dir: Path, chunk_files: Iterable[str]) -> Set[str]:
+    names: Set[str] = set()
+    for name in chunk_files:
+        for entry in _load(out_dir / name) or []:
+            if isinstance(entry, dict) and entry.get("detail"):
+                names.add(entry["detail"])
+    return names
+
+
+def listing(p: Paper, summary_chars: Optional[int] = SUMMARY_CHARS, detail: Optional[str] = None) -> Dict[str, Any]:
+    """The fields a card renders, with the abstract cut to `summary_chars` and empty fields left out."""
+    d: Dict[str, Any] = {"id": p.id, "title": p.title, "published": format_ts(p.published), "link": p.link}
+    if p.source:
+        d["source"] = p.source
+    if p.authors:
+        d["authors"] = p.authors[:CARD_AUTHORS]
+    summary = p.summary or ""
+    if summary_chars is not None and len(summary) > summary_chars:
+        d["summary"] = summary[:summary_chars]
+        d["more"] = True
+    elif summary:
+        d["summary"] = summary
+    if p.categories:
+        d["categories"] = p.categories
+    if p.matched_keywords:
+        d["matched_keywords"] = p.matched_keywords
+    if detail:
+        d["detail"] = detail
+    return d
+
+
+def shard(papers: Sequence[Paper], chunk_size: int = CHUNK_SIZE) -> List[List[Paper]]:
+    """Split papers (sorted newest first) into month-aligned chunks, newest first."""
+    size = max(1, chunk_size)
+    chunks: List[List[Paper]] = []
+    for _, group in groupby(papers, key=lambda p: (p.published.year, p.published.month)):
+        month = list(group)
+        # Anchor the cut at the oldest end so new papers only touch the newest chunk
+        cuts = list(range(len(month), 0, -size))
+        chunks.extend(month[max(0, end - size) : end] for end in reversed(cuts))
+    return chunks
+
+
+def write_chunks(
+    papers: Sequence[Paper],
+    writer: _Writer,
+    chunk_size: int = CHUNK_SIZE,
+    summary_chars: Optional[int] = SUMMARY_CHARS,
+    details: bool = False,
+) -> Tuple[List[Dict[str, Any]], Set[str]]:
+    """
+    Write content-hashed listing chunks (and, with `details`, one content-hashed
+    full record per paper). Returns the manifest entries, newest first, and the
+    detail files referenced.
+    """
+    entries: List[Dict[str, Any]] = []
+    detail_files: Set[str] = set()
+    for page in shard(papers, chunk_size):
+        rows = []
+        for p in page:
+            detail = writer.hashed(f"{DETAIL_DIR}/paper", _compact(p.to_dict())) if details else None
+            if detail:
+                detail_files.add(detail)
+            rows.append(listing(p, summary_chars, detail))
+        entries.append({
+            "file": writer.hashed(f"{CHUNK_DIR}/papers", _compact(rows)),
+            "count": len(page),
+            "newest": format_ts(page[0].published),
+            "oldest": format_ts(page[-1].published),
+        })
+    return entries, detail_files
+
+
+def write_search_index(papers: Sequence[Paper], writer: _Writer) -> Dict[str, Any]:
+    """
+    Write the search index for `papers` (newest first; doc id = position counted
+    from the oldest): one file per token prefix, a prefix -> file table and the
+    facet bitmaps. Returns the manifest's `search` entry.
+    """
+    oldest_first = list(reversed(papers))
+    shards = shard_postings(build_postings(oldest_first))
+    table = {
+        prefix: writer.hashed(f"{SEARCH_DIR}/{prefix}", _compact(postings))
+        for prefix, postings in sorted(shards.items())
+    }
+    return {
+        "prefix_len": PREFIX_LEN,
+        "min_token_len": MIN_TOKEN_LEN,
+        "stopwords": sorted(STOPWORDS),
+        "shards": writer.hashed(f"{SEARCH_DIR}/shards", _compact(table)),
+        "facets": writer.hashed(f"{SEARCH_DIR}/facets", _compact(build_facets(oldest_first))),
+    }
+
+
+def _prune(out_dir: Path, sub: str, keep: Set[str]) -> None:
+    for path in (out_dir / sub).glob("*.json*"):
+        base = path.name
+        for ext in (".gz", ".br"):
+            base = base.removesuffix(ext)
+        if f"{sub}/{base}" not in keep:
+            path.unlink()
+
+
+def export_site(
+    papers: Sequence[Paper],
+    out_dir: str | Path,
+    chunk_size: int = CHUNK_SIZE,
+    search: bool = True,
+    summary_chars: Optional[int] = SUMMARY_CHARS,
+    details: bool = False,
+    compress: bool = False,
+) -> Dict[str, Any]:
+    """
+    Write the chunked site data (and, with `search`, the search index) under
+    `out_dir` and return the manifest. Listings carry abstracts cut to
+    `summary_chars`; `details` adds a full record per paper; `compress` writes
+    .gz (and, with the brotli package, .br) siblings of every file.
+
+    Files referenced by neither the new nor the previous manifest are removed;
+    the previous generation is kept for pages that loaded the old manifest.
+    """
+    out = Path(out_dir)
+    writer = _Writer(out, compress)
+    ordered = sorted(papers, key=lambda p: p.published, reverse=True)
+    previous = referenced_files(out)
+
+    chunks, detail_files = write_chunks(ordered, writer, chunk_size, summary_chars, details)
+    manifest: Dict[str, Any] = {
+        "version": 1,
+        "generated": datetime.now(timezone.utc).strftime(ISO_FMT),
+        "total": len(ordered),
+        "chunk_size": chunk_size,
+        "summary_chars": summary_chars,  # listing abstracts are cut to this (null: whole); the page reads it
+        "keywords": sorted({k for p in ordered for k in p.matched_keywords or []}, key=str.lower),
+        "sources": sorted({p.source for p in ordered if p.source}, key=str.lower),
+        "chunks": chunks,
+    }
+    if search:
+        manifest["search"] = write_search_index(ordered, writer)
+    writer.text(MANIFEST, _compact(manifest))
+
+    current = referenced_files(out)
+    keep = previous | current
+    # Detail files stay while a kept chunk (current or previous generation) links to them
+    keep |= detail_files | _details_in(out, {f for f in previous - current if f.startswith(f"{CHUNK_DIR}/")})
+    for sub in (CHUNK_DIR, SEARCH_DIR, DETAIL_DIR):
+        _prune(out, sub, keep)
+    return manifest
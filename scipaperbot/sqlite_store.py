@@ -0,0 +1,250 @@
+from __future__ import annotations
+
+import json
+import sqlite3
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Collection, Iterable, Iterator, List, Optional, Sequence
+
+from scipaperbot.models import ISO_FMT, Paper
+from scipaperbot.storage import save_papers
+
+
+# SQLite paper store (stdlib sqlite3, single file). Papers are keyed by id, so an
+# upsert replaces the previous record instead of piling up duplicates, and the
+# usual reads (newest first, a date range, one source, one keyword, a DOI) are
+# index lookups. Dates are stored as ISO_FMT strings, which sort chronologically.
+# Title/summary are mirrored into an FTS5 index when the SQLite build has it.
+
+SQLITE_SUFFIXES = (".db", ".sqlite", ".sqlite3")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS papers (
+    id TEXT PRIMARY KEY,
+    title TEXT NOT NULL,
+    authors TEXT NOT NULL,
+    summary TEXT NOT NULL,
+    published TEXT NOT NULL,
+    updated TEXT,
+    link TEXT NOT NULL,
+    categories TEXT NOT NULL,
+    source TEXT NOT NULL COLLATE NOCASE,
+    doi TEXT COLLATE NOCASE,
+    primary_category TEXT
+);
+CREATE INDEX IF NOT EXISTS papers_published ON papers (published);
+CREATE INDEX IF NOT EXISTS papers_source ON papers (source, published);
+CREATE INDEX IF NOT EXISTS papers_doi ON papers (doi);
+CREATE TABLE IF NOT EXISTS paper_keywords (
+    keyword TEXT NOT NULL,
+    paper_id TEXT NOT NULL REFERENCES papers (id) ON DELETE CASCADE,
+    pos INTEGER NOT NULL,
+    PRIMARY KEY (keyword, paper_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS paper_keywords_paper ON paper_keywords (paper_id, pos);
+"""
+
+_FTS_SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS papers_fts USING fts5(
+    title, summary, content='papers', content_rowid='rowid'
+);
+CREATE TRIGGER IF NOT EXISTS papers_fts_insert AFTER INSERT ON papers BEGIN
+    INSERT INTO papers_fts (rowid, title, summary) VALUES (new.rowid, new.title, new.summary);
+END;
+CREATE TRIGGER IF NOT EXISTS papers_fts_delete AFTER DELETE ON papers BEGIN
+    INSERT INTO papers_fts (papers_fts, rowid, title, summary) VALUES ('delete', old.rowid, old.title, old.summary);
+END;
+CREATE TRIGGER IF NOT EXISTS papers_fts_update AFTER UPDATE OF title, summary ON papers BEGIN
+    INSERT INTO papers_fts (papers_fts, rowid, title, summary) VALUES ('delete', old.rowid, old.title, old.summary);
+    INSERT INTO papers_fts (rowid, title, summary) VALUES (new.rowid, new.title, new.summary);
+END;
+"""
+
+_COLUMNS = (
+    "p.id, p.title, p.authors, p.summary, p.published, p.updated, p.link, p.categories, p.source, p.doi, "
+    "p.primary_category, (SELECT json_group_array(keyword) FROM "
+    "(SELECT keyword FROM paper_keywords WHERE paper_id = p.id ORDER BY pos)) AS keywords"
+)
+
+_UPSERT = """
+INSERT INTO papers (id, title, authors, summary, published, updated, link, categories, source, doi, primary_category)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT (id) DO UPDATE SET
+    title = excluded.title, authors = excluded.authors, summary = excluded.summary,
+    published = excluded.published, updated = excluded.updated, link = excluded.link,
+    categories = excluded.categories, source = excluded.source, doi = excluded.doi,
+    primary_category = excluded.primary_category
+"""
+
+
+def is_sqlite_path(path: str | Path) -> bool:
+    return Path(path).suffix.lower() in SQLITE_SUFFIXES
+
+
+def _ts(dt: Optional[datetime]) -> Optional[str]:
+    return dt.strftime(ISO_FMT) if dt else None
+
+
+def _row_to_paper(row: Sequence[Any]) -> Paper:
+    keywords = json.loads(row[11]) if row[11] else []
+    return Paper(
+        id=row[0],
+        title=row[1],
+        authors=json.loads(row[2]),
+        summary=row[3],
+        published=datetime.strptime(row[4], ISO_FMT),
+        updated=datetime.strptime(row[5], ISO_FMT) if row[5] else None,
+        link=row[6],
+        categories=json.loads(row[7]),
+        source=row[8],
+        doi=row[9],
+        primary_category=row[10],
+        matched_keywords=keywords or None,
+    )
+
+
+class SQLiteStore:
+    """
+    Papers table plus a keyword join table in one SQLite file. Use as a context
+    manager: the changes made inside the block are committed on success and
+    rolled back on error (or when `rollback()` is called, e.g. for a dry run).
+    """
+
+    def __init__(self, path: str | Path) -> None:
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(str(self.path))
+        self.conn.execute("PRAGMA journal_mode = WAL")
+        self.conn.execute("PRAGMA synchronous = NORMAL")
+        self.conn.execute("PRAGMA foreign_keys = ON")
+        self.conn.executescript(_SCHEMA)
+        try:
+            self.conn.executescript(_FTS_SCHEMA)
+            self.fts = True
+        except sqlite3.OperationalError:  # SQLite built without FTS5
+            self.fts = False
+
+    def __enter__(self) -> "SQLiteStore":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc_type is None:
+            self.conn.commit()
+        else:
+            self.conn.rollback()
+        self.close()
+
+    def close(self) -> None:
+        self.conn.close()
+
+    def commit(self) -> None:
+        self.conn.commit()
+
+    def rollback(self) -> None:
+        self.conn.rollback()
+
+    # -- writes ------------------------------------------------------------
+    def upsert(self, papers: Iterable[Paper]) -> int:
+        """Insert or replace papers (and their matched keywords) by id; returns the number written."""
+        n = 0
+        cur = self.conn.cursor()
+        for p in papers:
+            cur.execute(_UPSERT, (
+                p.id, p.title, json.dumps(p.authors, ensure_ascii=False), p.summary or "",
+                _ts(p.published), _ts(p.updated), p.link or "", json.dumps(p.categories, ensure_ascii=False),
+                p.source, p.doi, p.primary_category,
+            ))
+            cur.execute("DELETE FROM paper_keywords WHERE paper_id = ?", (p.id,))
+            if p.matched_keywords:
+                cur.executemany(
+                    "INSERT OR IGNORE INTO paper_keywords (keyword, paper_id, pos) VALUES (?, ?, ?)",
+                    [(kw, p.id, i) for i, kw in enumerate(p.matched_keywords)],
+                )
+            n += 1
+        return n
+
+    # -- reads -------------------------------------------------------------
+    def count(self) -> int:
+        return self.conn.execute("SELECT COUNT(*) FROM papers").fetchone()[0]
+
+    def get(self, paper_id: str) -> Optional[Paper]:
+        row = self.conn.execute(f"SELECT {_COLUMNS} FROM papers p WHERE p.id = ?", (paper_id,)).fetchone()
+        return _row_to_paper(row) if row else None
+
+    def by_doi(self, doi: str) -> List[Paper]:
+        rows = self.conn.execute(f"SELECT {_COLUMNS} FROM papers p WHERE p.doi = ?", (doi,))
+        return [_row_to_paper(r) for r in rows]
+
+    def iter_query(
+        self,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+        sources: Optional[Iterable[str]] = None,
+        keyword: Optional[str] = None,
+        matched_only: bool = False,
+    ) -> Iterator[Paper]:
+        """Stream papers newest first, filtered by publication date range, source(s) and keyword."""
+        where: List[str] = []
+        args: List[Any] = []
+        if since is not None:
+            where.append("p.published >= ?")
+            args.append(_ts(since))
+        if until is not None:
+            where.append("p.published <= ?")
+            args.append(_ts(until))
+        if sources:
+            srcs = list(sources)
+            where.append(f"p.source IN ({', '.join('?' * len(srcs))})")
+            args.extend(srcs)
+        if keyword is not None:
+            where.append("p.id IN (SELECT paper_id FROM paper_keywords WHERE keyword = ?)")
+            args.append(keyword)
+        if matched_only:
+            where.append("EXISTS (SELECT 1 FROM paper_keywords k WHERE k.paper_id = p.id)")
+        sql = f"SELECT {_COLUMNS} FROM papers p"
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        sql += " ORDER BY p.published DESC, p.id"
+        for row in self.conn.execute(sql, args):
+            yield _row_to_paper(row)
+
+    def query(self, limit: Optional[int] = None, **filters: Any) -> List[Paper]:
+        out: List[Paper] = []
+        for p in self.iter_query(**filters):
+            if limit is not None and len(out) >= limit:
+                break
+            out.append(p)
+        return out
+
+    def recent(
+        self,
+        since: datetime,
+        sources: Optional[Iterable[str]] = None,
+        limit: Optional[int] = None,
+        exclude: Collection[str] = (),
+    ) -> List[Paper]:
+        """Newest matched papers published since `since` whose ids are not in `exclude` (e.g. already posted)."""
+        out: List[Paper] = []
+        for p in self.iter_query(since=since, sources=sources, matched_only=True):
+            if limit is not None and len(out) >= limit:
+                break
+            if p.id not in exclude:
+                out.append(p)
+        return out
+
+    def search(self, text: str, limit: int = 20) -> List[Paper]:
+        """Full-text search over title and summary (FTS5 query syntax), best matches first."""
+        if not self.fts:
+            raise RuntimeError("This SQLite build has no FTS5 support")
+        rows = self.conn.execute(
+            f"SELECT {_COLUMNS} FROM papers_fts f JOIN papers p ON p.rowid = f.rowid "
+            "WHERE papers_fts MATCH ? ORDER BY bm25(papers_fts) LIMIT ?",
+            (text, limit),
+        )
+        return [_row_to_paper(r) for r in rows]
+
+    def export(self, path: str | Path, since: Optional[datetime] = None) -> int:
+        """Write matched papers (newest first) to a JSON/JSON Lines file; returns the number written."""
+        papers = list(self.iter_query(since=since, matched_only=True))
+        save_papers(path, papers)
+        return len(papers)
@@ -1,30 +1,195 @@
 from __future__ import annotations
 
 import json
+import os
+import tempfile
 from pathlib import Path
-from typing import List, Dict, Any
+from typing import Any, Callable, Dict, IO, Iterable, Iterator, List
 
 from scipaperbot.models import Paper
 
+try:  # optional: several times faster JSON encoding/decoding
+    import orjson
+except ImportError:  # pragma: no cover - fall back to the stdlib
+    orjson = None
 
-def load_papers(path: str | Path) -> List[Paper]:
+
+# Two on-disk formats:
+# - JSON array (site/data/papers.json): the export read by the static site.
+# - JSON Lines (*.jsonl): the append-friendly archive. New records are appended,
+#   later lines supersede earlier ones with the same id, and compaction rewrites
+#   the file with one line per id. Every full rewrite goes through a temp file and
+#   an atomic rename, so a crashed run leaves the previous file intact.
+
+
+def _loads(s: str | bytes) -> Any:
+    return orjson.loads(s) if orjson is not None else json.loads(s)
+
+
+def _dumps_line(d: Dict[str, Any]) -> str:
+    if orjson is not None:
+        return orjson.dumps(d).decode("utf-8")
+    return json.dumps(d, ensure_ascii=False)
+
+
+def _is_jsonl(p: Path) -> bool:
+    return p.suffix.lower() in (".jsonl", ".ndjson")
+
+
+def atomic_write(path: Path, write: Callable[[IO], None], binary: bool = False) -> None:
+    """Write `path` through a temp file in the same directory, fsync it and rename it into place."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(prefix=f".{path.name}.", suffix=".tmp", dir=path.parent)
+    try:
+        with (os.fdopen(fd, "wb") if binary else os.fdopen(fd, "w", encoding="utf-8")) as f:
+            write(f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        raise
+
+
+def _iter_jsonl(p: Path) -> Iterator[Dict]:
+    with p.open("r", encoding="utf-8") as f:
+        for line in f:
+            if not line.strip():
+                continue
+            try:
+                yield _loads(line)
+            except ValueError:  # json.JSONDecodeError / orjson.JSONDecodeError
+                # A torn final line from an interrupted append is skipped; anything else is corruption
+                if line.endswith("\n") or f.readline():
+                    raise
+                return
+
+
+def iter_papers(path: str | Path) -> Iterator[Paper]:
+    """Stream papers from a JSON Lines archive (line by line) or a JSON array export."""
     p = Path(path)
     if not p.exists():
-        return []
-    with p.open("r", encoding="utf-8") as f:
-        data = json.load(f)
+        return
+    if _is_jsonl(p):
+        for d in _iter_jsonl(p):
+            yield Paper.from_dict(d)
+        return
+    with p.open("rb") as f:
+        data = _loads(f.read())
     if isinstance(data, dict) and "papers" in data:
         items = data["papers"]
     else:
         items = data
-    return [Paper.from_dict(d) for d in items]
+    for d in items:
+        yield Paper.from_dict(d)
+
 
+def load_papers(path: str | Path) -> List[Paper]:
+    return list(iter_papers(path))
 
-def save_papers(path: str | Path, papers: List[Paper]) -> None:
+
+def save_papers(path: str | Path, papers: Iterable[Paper]) -> None:
+    p = Path(path)
+    if _is_jsonl(p):
+        save_records(p, (paper.to_dict() for paper in papers))
+        return
+    if orjson is not None:
+        def write(f: IO[str]) -> None:
+            f.write(orjson.dumps([paper.to_dict() for paper in papers], option=orjson.OPT_INDENT_2).decode("utf-8"))
+    else:
+        def write(f: IO[str]) -> None:
+            json.dump([paper.to_dict() for paper in papers], f, ensure_ascii=False, indent=2)
+    atomic_write(p, write)
+
+
+def _trim_torn_tail(p: Path) -> None:
+    # Drop a partial last line left by an interrupted append, so new lines start clean
+    with p.open("rb+") as f:
+        size = f.seek(0, os.SEEK_END)
+        if size == 0:
+            return
+        f.seek(size - 1)
+        if f.read(1) == b"\n":
+            return
+        keep = size
+        while keep > 0:
+            step = min(keep, 64 * 1024)
+            f.seek(keep - step)
+            nl = f.read(step).rfind(b"\n")
+            if nl >= 0:
+                keep = keep - step + nl + 1
+                break
+            keep -= step
+        f.truncate(keep)
+
+
+def iter_records(path: str | Path) -> Iterator[Dict]:
+    """Stream the objects of a JSON Lines file (nothing if it does not exist)."""
+    p = Path(path)
+    if p.exists():
+        yield from _iter_jsonl(p)
+
+
+def append_records(path: str | Path, records: Iterable[Dict[str, Any]]) -> int:
+    """Append objects to a JSON Lines file and fsync; returns the number appended."""
     p = Path(path)
     p.parent.mkdir(parents=True, exist_ok=True)
-    with p.open("w", encoding="utf-8") as f:
-        json.dump([paper.to_dict() for paper in papers], f, ensure_ascii=False, indent=2)
+    if p.exists():
+        _trim_torn_tail(p)
+    n = 0
+    with p.open("a", encoding="utf-8") as f:
+        for d in records:
+            f.write(_dumps_line(d))
+            f.write("\n")
+            n += 1
+        f.flush()
+        os.fsync(f.fileno())
+    return n
+
+
+def save_records(path: str | Path, records: Iterable[Dict[str, Any]]) -> None:
+    """Atomically replace a JSON Lines file with `records`."""
+    def write(f: IO[str]) -> None:
+        for d in records:
+            f.write(_dumps_line(d))
+            f.write("\n")
+    atomic_write(Path(path), write)
+
+
+def append_papers(path: str | Path, papers: Iterable[Paper]) -> int:
+    """Append papers to a JSON Lines archive and fsync; returns the number appended."""
+    return append_records(path, (paper.to_dict() for paper in papers))
+
+
+def compact_papers(path: str | Path, min_garbage: float = 0.0) -> bool:
+    """
+    Rewrite a JSON Lines archive with one line per id (the last written wins),
+    newest first. Skipped unless superseded lines make up more than `min_garbage`
+    of the file. Returns True when the file was rewritten.
+    """
+    p = Path(path)
+    if not p.exists():
+        return False
+    lines = 0
+    ids = set()
+    for d in _iter_jsonl(p):
+        lines += 1
+        ids.add(d.get("id"))
+    if lines == 0 or (lines - len(ids)) / lines <= min_garbage:
+        return False
+    save_papers(p, latest_papers(iter_papers(p)))
+    return True
+
+
+def latest_papers(papers: Iterable[Paper]) -> List[Paper]:
+    """One paper per id, the last one in the stream winning (archive order), newest first."""
+    latest: Dict[str, Paper] = {}
+    for paper in papers:
+        latest[paper.id] = paper
+    return sorted(latest.values(), key=lambda x: x.published, reverse=True)
 
 
 def dedupe_and_sort(papers: List[Paper]) -> List[Paper]:
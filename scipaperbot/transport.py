@@ -0,0 +1,264 @@
+from __future__ import annotations
+
+import os
+import random
+import threading
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Any, Callable, Dict, Optional, Union
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from scipaperbot import metrics
+from scipaperbot.cache import OfflineCacheMiss, ResponseCache, request_key
+
+
+# Shared HTTP transport for all fetchers: one keep-alive Session (urllib3 pools
+# connections per host), retries with exponential backoff + jitter that honour
+# Retry-After, a per-host request rate limit and an optional on-disk response cache.
+# Requests, bytes, retries, cache hits and HTTP seconds are counted per `source`
+# in scipaperbot.metrics. A source's requests can be pointed at another server
+# (such as benchmarks/mock_upstream.py) with `set_base_url`.
+
+USER_AGENT = "scipaperbot/0.1 (+https://github.com/)"
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+MAX_RETRIES = 5
+BACKOFF_BASE = 1.0  # seconds; doubled on every attempt
+BACKOFF_CAP = 60.0
+
+
+def _ncbi_rate() -> float:
+    return 10.0 if os.getenv("NCBI_API_KEY") else 3.0
+
+
+# Requests per second allowed per host. NCBI allows 3 req/s without an API key and
+# 10 req/s with one; arXiv asks for no more than one request every 3 seconds.
+# A callable is resolved on the host's first request, once the environment
+# (including .env) is loaded.
+RATE_LIMITS: Dict[str, Union[float, Callable[[], float]]] = {
+    "eutils.ncbi.nlm.nih.gov": _ncbi_rate,
+    "export.arxiv.org": 1 / 3,
+    "api.crossref.org": 10.0,
+    "api.biorxiv.org": 5.0,
+}
+
+_session: Optional[requests.Session] = None
+_session_lock = threading.Lock()
+_limiters: Dict[str, "_HostLimiter"] = {}
+_limiters_lock = threading.Lock()
+_cache: Optional[ResponseCache] = None
+_base_urls: Dict[str, str] = {}
+
+
+class _HostLimiter:
+    """Spaces requests to one host at least 1/rate seconds apart (thread-safe)."""
+
+    def __init__(self, rate: float) -> None:
+        self.interval = 1.0 / rate if rate > 0 else 0.0
+        self._next = 0.0
+        self._lock = threading.Lock()
+
+    def wait(self) -> None:
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next)
+            self._next = slot + self.interval
+        if slot > now:
+            time.sleep(slot - now)
+
+
+def session() -> requests.Session:
+    global _session
+    with _session_lock:
+        if _session is None:
+            s = requests.Session()
+            adapter = HTTPAdapter(pool_connections=16, pool_maxsize=16)
+            s.mount("https://", adapter)
+            s.mount("http://", adapter)
+            s.headers["User-Agent"] = USER_AGENT
+            _session = s
+        return _session
+
+
+def set_rate_limit(host: str, rate: Optional[float]) -> None:
+    """Set (or with None, remove) the requests-per-second limit for `host`."""
+    with _limiters_lock:
+        if rate is None:
+            RATE_LIMITS.pop(host, None)
+        else:
+            RATE_LIMITS[host] = rate
+        _limiters.pop(host, None)
+
+
+def set_cache(cache: Optional[ResponseCache]) -> None:
+    """Install (or with None, remove) the response cache consulted by `request`."""
+    global _cache
+    _cache = cache
+
+
+def set_base_url(source: str, base_url: Optional[str]) -> None:
+    """Send requests made for `source` to `base_url` instead of the upstream host (None restores it)."""
+    if base_url:
+        _base_urls[source] = base_url.rstrip("/")
+    else:
+        _base_urls.pop(source, None)
+
+
+def _route(url: str, source: Optional[str]) -> str:
+    base = _base_urls.get(source) if source else None
+    if not base:
+        return url
+    parts = urlsplit(url)
+    return base + parts.path + (f"?{parts.query}" if parts.query else "")
+
+
+def _limiter(host: str) -> Optional[_HostLimiter]:
+    with _limiters_lock:
+        lim = _limiters.get(host)
+        if lim is None:
+            rate = RATE_LIMITS.get(host)
+            rate = rate() if callable(rate) else rate
+            if not rate:
+                return None
+            lim = _limiters[host] = _HostLimiter(rate)
+        return lim
+
+
+def _retry_after(resp: requests.Response) -> Optional[float]:
+    value = resp.headers.get("Retry-After")
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        when = parsedate_to_datetime(value)
+    except Exception:
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())
+
+
+def _backoff(attempt: int) -> float:
+    # "Full jitter": uniform in [0, min(cap, base * 2**attempt)]
+    return random.uniform(0, min(BACKOFF_CAP, BACKOFF_BASE * (2 ** attempt)))
+
+
+def request(
+    method: str,
+    url: str,
+    *,
+    params: Optional[Dict[str, Any]] = None,
+    data: Optional[Dict[str, Any]] = None,
+    headers: Optional[Dict[str, str]] = None,
+    timeout: float = 30,
+    max_retries: int = MAX_RETRIES,
+    source: Optional[str] = None,
+    reuse: bool = True,
+) -> requests.Response:
+    """
+    Send a request through the shared session. Connection errors, timeouts and
+    429/5xx responses are retried up to `max_retries` times; the final response is
+    returned as-is so callers can still `raise_for_status()`.
+
+    When a cache is installed, a cached response younger than the TTL of `source`
+    is returned without touching the network; older entries are revalidated with
+    ETag/Last-Modified when upstream supplied them. In offline mode any cached
+    response is replayed and a miss raises OfflineCacheMiss. With `reuse=False`
+    (for responses only valid briefly, such as E-utilities history sessions) a
+    cached response is only ever replayed offline: online the request always goes
+    upstream, and its response is recorded for later offline runs.
+
+    A base URL installed for `source` with `set_base_url` replaces the scheme and
+    host; rate limits and cache entries then follow the replacement host.
+    """
+    url = _route(url, source)
+    cache = _cache
+    if cache is None:
+        return _send(method, url, params, data, headers, timeout, max_retries, source)
+
+    key = request_key(method, url, params, data)
+    entry = cache.get(key)
+    if cache.offline:
+        if entry is None:
+            raise OfflineCacheMiss(f"No cached response for {method} {url}")
+        metrics.count(source, "cache_hits")
+        return entry.to_response()
+    if not reuse:
+        resp = _send(method, url, params, data, headers, timeout, max_retries, source)
+        if resp.status_code == 200:
+            cache.put(key, resp, source)
+        return resp
+    if entry is not None and entry.age() < cache.ttl(source):
+        metrics.count(source, "cache_hits")
+        return entry.to_response()
+
+    if entry is not None and entry.validators():
+        headers = {**(headers or {}), **entry.validators()}
+    resp = _send(method, url, params, data, headers, timeout, max_retries, source)
+    if resp.status_code == 304 and entry is not None:
+        metrics.count(source, "cache_revalidated")
+        cache.refresh(key)
+        return entry.to_response()
+    if resp.status_code == 200:
+        cache.put(key, resp, source)
+    return resp
+
+
+def _send(
+    method: str,
+    url: str,
+    params: Optional[Dict[str, Any]],
+    data: Optional[Dict[str, Any]],
+    headers: Optional[Dict[str, str]],
+    timeout: float,
+    max_retries: int,
+    source: Optional[str] = None,
+) -> requests.Response:
+    host = urlsplit(url).netloc
+    sess = session()
+    attempt = 0
+    started = time.perf_counter()
+    try:
+        while True:
+            lim = _limiter(host)
+            if lim:
+                lim.wait()
+            metrics.count(source, "requests")
+            try:
+                resp = sess.request(method, url, params=params, data=data, headers=headers, timeout=timeout)
+            except (requests.ConnectionError, requests.Timeout):
+                metrics.count(source, "request_errors")
+                if attempt >= max_retries:
+                    raise
+                metrics.count(source, "retries")
+                time.sleep(_backoff(attempt))
+                attempt += 1
+                continue
+
+            if resp.status_code not in RETRY_STATUSES or attempt >= max_retries:
+                metrics.count(source, "bytes", len(resp.content))
+                return resp
+            metrics.count(source, "retries")
+            delay = _retry_after(resp)
+            time.sleep(min(BACKOFF_CAP, delay) if delay is not None else _backoff(attempt))
+            resp.close()
+            attempt += 1
+    finally:
+        # Includes rate-limit waits and backoff sleeps: the time this source spent on HTTP
+        elapsed = time.perf_counter() - started
+        metrics.count(source, "http_seconds", elapsed)
+        metrics.waited(elapsed)
+
+
+def get(url: str, **kwargs: Any) -> requests.Response:
+    return request("GET", url, **kwargs)
+
+
+def post(url: str, **kwargs: Any) -> requests.Response:
+    return request("POST", url, **kwargs)
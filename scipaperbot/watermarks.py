@@ -0,0 +1,86 @@
+from __future__ import annotations
+
+import json
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from scipaperbot.models import ISO_FMT
+
+
+# Per-source high-water marks: the newest date each source has returned in a written
+# run (the publication date, or for PubMed the date the record was indexed). The next
+# run only asks each source for papers from its mark minus an overlap instead of the
+# full window.
+
+# Sources whose windows are on a publication date that can lie well before the record
+# is indexed (Crossref `from-pub-date`; PubMed issue dates, which also guide its
+# Entrez-date window). Their overlap defaults to the whole days_back window.
+LATE_INDEXED = frozenset({"pubmed", "chemrxiv"})
+
+
+def load_watermarks(path: str | Path) -> Dict[str, datetime]:
+    p = Path(path)
+    if not p.exists():
+        return {}
+    with p.open("r", encoding="utf-8") as f:
+        data = json.load(f)
+    marks: Dict[str, datetime] = {}
+    for source, value in data.items():
+        try:
+            marks[source] = datetime.strptime(value, ISO_FMT)
+        except (TypeError, ValueError):
+            continue
+    return marks
+
+
+def save_watermarks(path: str | Path, marks: Dict[str, datetime]) -> None:
+    p = Path(path)
+    p.parent.mkdir(parents=True, exist_ok=True)
+    with p.open("w", encoding="utf-8") as f:
+        json.dump({k: v.strftime(ISO_FMT) for k, v in sorted(marks.items())}, f, indent=2)
+
+
+def overlap_days(setting: Any, source: str, days_back: int) -> float:
+    """
+    Overlap for `source` from the `overlap_days` setting: a mapping of source to
+    days (`default` for the rest), or one number as that default. LATE_INDEXED
+    sources only take a value listed under their own name and otherwise overlap
+    by the whole `days_back`; the default default is 1 day.
+    """
+    per_source = setting if isinstance(setting, dict) else {"default": setting}
+    value = per_source.get(source)
+    if value is None:
+        if source in LATE_INDEXED:
+            return float(days_back)
+        value = per_source.get("default")
+    return float(value) if value is not None else 1.0
+
+
+def window_start(
+    marks: Dict[str, datetime],
+    source: str,
+    cutoff: datetime,
+    overlap: timedelta = timedelta(days=1),
+) -> datetime:
+    """Start of the fetch window for `source`: its mark minus `overlap`, never before `cutoff`."""
+    mark = marks.get(source)
+    if mark is None:
+        return cutoff
+    return max(cutoff, mark - overlap)
+
+
+def advance(
+    marks: Dict[str, datetime],
+    source: str,
+    newest: Optional[datetime],
+    now: datetime,
+) -> Optional[datetime]:
+    """Move the mark for `source` to `newest` (the latest date fetched), clamped to `now`."""
+    if newest is None:
+        return marks.get(source)
+    # Print dates (e.g. PubMed "2026 Jan") can lie in the future; never skip ahead of today.
+    newest = min(newest, now)
+    if source not in marks or newest > marks[source]:
+        marks[source] = newest
+    return marks[source]
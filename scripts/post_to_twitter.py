@@ -1,7 +1,6 @@
 from __future__ import annotations
 
 import argparse
-import json
 import os
 import sys
 from pathlib import Path
@@ -11,6 +10,7 @@ ROOT = Path(__file__).resolve().parents[1]
 if str(ROOT) not in sys.path:
     sys.path.insert(0, str(ROOT))
 from datetime import datetime, timedelta, timezone
+from itertools import islice
 from typing import List, Dict, Any
 
 import yaml
@@ -21,7 +21,10 @@ try:
 except Exception:
     pass
 
+from scipaperbot.dedupe import merge_duplicates
 from scipaperbot.models import Paper
+from scipaperbot.posted import LEDGER_PATH, LEGACY_PATH, TTL_DAYS, PostedLedger
+from scipaperbot.sqlite_store import SQLiteStore, is_sqlite_path
 from scipaperbot.storage import load_papers
 from scipaperbot.twitter import TwitterClient
 from scipaperbot.fetchers.biorxiv import fetch_rxiv
@@ -33,23 +36,6 @@ def load_config(path: Path) -> Dict[str, Any]:
         return yaml.safe_load(f)
 
 
-def load_posted(path: Path) -> set[str]:
-    if not path.exists():
-        return set()
-    with path.open("r", encoding="utf-8") as f:
-        try:
-            data = json.load(f)
-            return set(data)
-        except Exception:
-            return set()
-
-
-def save_posted(path: Path, ids: set[str]) -> None:
-    path.parent.mkdir(parents=True, exist_ok=True)
-    with path.open("w", encoding="utf-8") as f:
-        json.dump(sorted(list(ids)), f, ensure_ascii=False, indent=2)
-
-
 def compose_tweet(p: Paper, hashtags: List[str]) -> str:
     # Keep it short: Title + link + tags (prefer <= 3 tags)
     base = p.title.strip()
@@ -88,6 +74,7 @@ def main(argv: List[str]) -> int:
 
     cfg = load_config(Path(args.config))
     site_data_path = Path(cfg.get("site_data_path", "site/data/papers.json"))
+    store_path = Path((cfg.get("store", {}) or {}).get("path", "data/papers.jsonl"))
     twitter_cfg = cfg.get("twitter", {})
     hashtags = twitter_cfg.get("hashtags", ["arXiv", "AI"])
     max_posts = args.max if args.max is not None else int(twitter_cfg.get("max_posts", 5))
@@ -97,6 +84,11 @@ def main(argv: List[str]) -> int:
     now = datetime.now(timezone.utc).astimezone(tz=None).replace(tzinfo=None)
     cutoff = now - timedelta(days=int(args.days))
 
+    posted_path = Path(twitter_cfg.get("posted_path", LEDGER_PATH))
+    # Entries expire one TTL after max(posted, published), so the TTL must cover the posting window
+    ttl_days = max(float(twitter_cfg.get("posted_ttl_days", TTL_DAYS)), float(args.days))
+    ledger = PostedLedger(posted_path, ttl_days=ttl_days, legacy_path=LEGACY_PATH)
+
     if args.live_biorxiv:
         start_str = (now - timedelta(days=int(args.days))).strftime("%Y-%m-%d")
         end_str = now.strftime("%Y-%m-%d")
@@ -112,6 +104,11 @@ def main(argv: List[str]) -> int:
                 if hits:
                     p.matched_keywords = hits
                     papers.append(p)
+    elif is_sqlite_path(store_path) and store_path.exists():
+        # Indexed query: newest matched papers since the cutoff, minus those already posted,
+        # with cross-source duplicates folded together (the site export is already merged)
+        with SQLiteStore(store_path) as db:
+            papers = merge_duplicates(db.recent(cutoff, sources=args.source, exclude=ledger.ids()))
     else:
         papers = load_papers(site_data_path)
 
@@ -120,10 +117,8 @@ def main(argv: List[str]) -> int:
         srcset = set([s.lower() for s in args.source])
         recent = [p for p in recent if (p.source or "").lower() in srcset]
 
-    posted_path = Path("data/posted_ids.json")
-    posted = load_posted(posted_path)
-
-    to_post = [p for p in recent if p.id not in posted][:max_posts]
+    # Not posted before under this id or DOI, and one paper per work within this run
+    to_post = list(islice(ledger.unposted(recent), max_posts))
 
     if not to_post:
         print("Nothing new to post.")
@@ -142,11 +137,11 @@ def main(argv: List[str]) -> int:
     for p in to_post:
         text = compose_tweet(p, hashtags)
         client.post(text)
-        posted.add(p.id)
+        ledger.add(p)  # appended right away, so a failure later in the run cannot re-post it
         print("Posted:", text)
 
-    save_posted(posted_path, posted)
-    print(f"Saved posted IDs -> {posted_path}")
+    dropped = ledger.compact()
+    print(f"Recorded {len(to_post)} posts -> {posted_path} ({len(ledger)} kept, {dropped} expired)")
     return 0
 
 
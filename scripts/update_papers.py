@@ -8,18 +8,36 @@ from pathlib import Path
 ROOT = Path(__file__).resolve().parents[1]
 if str(ROOT) not in sys.path:
     sys.path.insert(0, str(ROOT))
-from datetime import datetime, timedelta, timezone
-from typing import List, Dict, Any
-import re
+from contextlib import nullcontext
+from datetime import date, datetime, timedelta, timezone
+from typing import List, Dict, Any, Iterable, Iterator, Optional, Tuple
+from concurrent.futures import Executor
+from functools import lru_cache
+from itertools import chain, islice
 
 import yaml
 
-from scipaperbot.fetchers.arxiv import fetch_arxiv_papers
-from scipaperbot.fetchers.biorxiv import fetch_rxiv
-from scipaperbot.fetchers.pubmed import fetch_pubmed
-from scipaperbot.fetchers.chemrxiv import fetch_chemrxiv
+try:
+    from dotenv import load_dotenv
+    load_dotenv()
+except Exception:
+    pass
+
+from scipaperbot import metrics, transport
+from scipaperbot.backfill import Checkpoint, date_shards, run_backfill
+from scipaperbot.cache import ResponseCache
+from scipaperbot.dedupe import SOURCE_PRIORITY, TITLE_THRESHOLD, merge_duplicates
+from scipaperbot.fetchers.arxiv import iter_arxiv_papers
+from scipaperbot.fetchers.biorxiv import iter_rxiv
+from scipaperbot.fetchers.pubmed import iter_pubmed
+from scipaperbot.fetchers.chemrxiv import iter_chemrxiv
+from scipaperbot.matching import KeywordMatcher, matcher_pool, select_matched
 from scipaperbot.models import Paper
-from scipaperbot.storage import save_papers, dedupe_and_sort
+from scipaperbot.orchestrator import FetchTask, fetch_all
+from scipaperbot.site_export import CHUNK_SIZE, MANIFEST, SUMMARY_CHARS, export_site
+from scipaperbot.sqlite_store import SQLiteStore, is_sqlite_path
+from scipaperbot.storage import append_papers, compact_papers, iter_papers, latest_papers, save_papers
+from scipaperbot.watermarks import advance, load_watermarks, overlap_days, save_watermarks, window_start
 
 
 def load_config(path: Path) -> Dict[str, Any]:
@@ -27,86 +45,352 @@ def load_config(path: Path) -> Dict[str, Any]:
         return yaml.safe_load(f)
 
 
+@lru_cache(maxsize=8)
+def _matcher(keywords: Tuple[str, ...]) -> KeywordMatcher:
+    return KeywordMatcher(keywords)
+
+
 def match_keywords(paper: Paper, keywords: List[str]) -> List[str]:
     """Return keywords matched using biology-oriented, word-boundary aware rules.
     - Uses word boundaries to avoid false positives (e.g., 'PAge' != 'aging').
     - Handles combined phrases like 'DNA damage & Repair' by requiring key tokens.
     - Supports DDR as acronym or 'dna damage response'.
+    The rules are compiled once per keyword list (see scipaperbot.matching).
     """
-    text = f"{paper.title}\n{paper.summary}"
-    text_lower = text.lower()
-    words = set(re.findall(r"[a-zA-Z]+", text_lower))
+    return _matcher(tuple(keywords)).match(paper.title, paper.summary)
 
-    matches: List[str] = []
 
-    # Pre-compiled patterns
-    pat_aging = re.compile(r"\baging\b|\bageing\b|\bsenescent\b|\bsenescence\b", re.I)
-    pat_ddr = re.compile(r"\bddr\b|\bdna\s+damage\s+response\b", re.I)
-    pat_dna_damage = re.compile(r"\bdna\s+damage\b", re.I)
-    pat_repair = re.compile(r"\brepair\b", re.I)
+def configure_cache(cfg: Dict[str, Any], offline: bool = False, disabled: bool = False) -> ResponseCache | None:
+    """Install the on-disk HTTP response cache described by the `cache` config block."""
+    cache_cfg = cfg.get("cache", {}) or {}
+    if disabled or not (offline or cache_cfg.get("enabled", False)):
+        transport.set_cache(None)
+        return None
+    cache = ResponseCache(
+        cache_cfg.get("dir", "data/http_cache"),
+        max_bytes=int(float(cache_cfg.get("max_mb", 256)) * 1024 * 1024),
+        ttls=cache_cfg.get("ttl", {}) or {},
+        offline=offline or bool(cache_cfg.get("offline", False)),
+    )
+    transport.set_cache(cache)
+    return cache
 
-    def has_aging() -> bool:
-        return bool(pat_aging.search(text))
 
-    def has_ddr() -> bool:
-        return bool(pat_ddr.search(text))
+def configure_upstreams(cfg: Dict[str, Any]) -> None:
+    """Point sources at the servers listed in `fetch.base_urls` (e.g. a local mock upstream)."""
+    base_urls = (cfg.get("fetch", {}) or {}).get("base_urls", {}) or {}
+    for source, base_url in base_urls.items():
+        transport.set_base_url(source, base_url)
+        print(f"[{source}] using {base_url}")
 
-    def has_dna_damage() -> bool:
-        return bool(pat_dna_damage.search(text))
 
-    def has_repair() -> bool:
-        return bool(pat_repair.search(text))
-
-    for kw in keywords:
-        k = kw.strip()
-        kl = k.lower()
-        if not k:
-            continue
+SOURCES = ("arxiv", "biorxiv", "medrxiv", "pubmed", "chemrxiv")
 
-        if kl in {"ageing", "aging"}:
-            if has_aging():
-                matches.append(kw)
-            continue
 
-        if kl in {"ddr", "dna damage response"}:
-            if has_ddr():
-                matches.append(kw)
-            continue
+def enabled_sources(cfg: Dict[str, Any]) -> List[str]:
+    sources_cfg = cfg.get("sources", {}) or {}
+    # arXiv is on unless disabled; the other sources are opt-in
+    return [s for s in SOURCES if bool(sources_cfg.get(s, s == "arxiv"))]
 
-        if kl in {"dna damage", "damage repair"}:
-            # Require presence of key tokens
-            if has_dna_damage() or ("dna" in words and has_repair()):
-                matches.append(kw)
-            continue
 
-        if "dna damage" in kl and "repair" in kl:
-            # For 'DNA damage and Repair' / 'DNA damage & Repair'
-            if has_dna_damage() and has_repair():
-                matches.append(kw)
-            continue
-
-        # Default: whole-phrase word-boundary match
-        pat = re.compile(r"\b" + re.escape(kl) + r"\b", re.I)
-        if pat.search(text):
-            matches.append(kw)
-
-    return matches
+def build_fetch_tasks(
+    cfg: Dict[str, Any],
+    keywords: List[str],
+    categories: List[str],
+    windows: Dict[str, Tuple[str, str]],
+    max_results: Optional[int] = None,
+) -> Dict[str, FetchTask]:
+    """
+    Map each source in `windows` to a zero-argument fetch callable over its (start, end)
+    date range. Every source streams its whole window; `max_results` optionally caps
+    the number of papers taken from each source.
+    """
+    pub_email = (cfg.get("pubmed", {}) or {}).get("email")
+
+    def task(source: str, start_str: str, end_str: str) -> FetchTask:
+        if source == "arxiv":
+            # Pages until submissions fall before the window start; no result cap
+            return lambda: iter_arxiv_papers(
+                keywords=keywords, categories=categories, start_date=start_str, end_date=end_str,
+            )
+        if source in ("biorxiv", "medrxiv"):
+            subjects = (cfg.get(source, {}) or {}).get("categories") or None
+            return lambda: iter_rxiv(source, start_str, end_str, categories=subjects)
+        if source == "pubmed":
+            # Pages through every hit in the window (bisecting it past PubMed's 10k search limit)
+            return lambda: iter_pubmed(keywords=keywords, start_date=start_str, end_date=end_str, email=pub_email)
+        if source == "chemrxiv":
+            # One combined Crossref query, deep-paged with cursors
+            return lambda: iter_chemrxiv(keywords=keywords, start_date=start_str, end_date=end_str)
+        raise ValueError(f"Unknown source: {source}")
+
+    def capped(fetch: FetchTask) -> FetchTask:
+        return fetch if max_results is None else (lambda: islice(fetch(), max_results))
+
+    return {source: capped(task(source, start_str, end_str)) for source, (start_str, end_str) in windows.items()}
+
+
+# Sources whose server-side window is on the date a record was indexed rather than
+# published (PubMed's Entrez date, which the fetcher stores as `updated`)
+INDEX_DATED = frozenset({"pubmed"})
+
+
+def _observe(papers: Iterable[Paper], stats: Dict[str, Any], indexed: bool = False) -> Iterator[Paper]:
+    """Pass papers through, counting them and recording the newest publication (or `indexed`) date."""
+    stats.setdefault("fetched", 0)
+    stats.setdefault("newest", None)
+    for p in papers:
+        stats["fetched"] += 1
+        seen = (p.updated or p.published) if indexed else p.published
+        if stats["newest"] is None or seen > stats["newest"]:
+            stats["newest"] = seen
+        yield p
+
+
+def select_matches(
+    source: str,
+    papers: Iterable[Paper],
+    since: datetime,
+    keywords: List[str],
+    bio_only: bool,
+    stats: Dict[str, Any],
+    chunk_size: int = 500,
+    processes: Optional[int] = None,
+    pool: Optional[Executor] = None,
+) -> Iterator[Paper]:
+    """
+    Filter a stream of fetched papers down to keyword matches as they arrive,
+    in chunks (date cutoff, keyword masks and the ChemRxiv bio gate applied in bulk).
+    Records the number fetched and the newest date seen in `stats`.
+    `processes` chunks at a time are matched in parallel on `pool` when given.
+    INDEX_DATED sources skip the publication date cutoff: their window already
+    holds exactly the records indexed since `since`, whatever their issue date.
+    """
+    indexed = source in INDEX_DATED
+    return select_matched(
+        _matcher(tuple(keywords)),
+        _observe(papers, stats, indexed),
+        since=None if indexed else since,
+        # Optional biology context gate for ChemRxiv
+        require_bio=source == "chemrxiv" and bio_only,
+        chunk_size=chunk_size,
+        processes=processes,
+        pool=pool,
+    )
+
+
+def dedupe_export(cfg: Dict[str, Any], papers: List[Paper]) -> List[Paper]:
+    """Merge cross-source duplicates (same DOI, arXiv id or title) as set up in the `dedupe` config block."""
+    dd_cfg = cfg.get("dedupe", {}) or {}
+    if not dd_cfg.get("enabled", True):
+        return papers
+    with metrics.stage("dedupe"):
+        merged = merge_duplicates(
+            papers,
+            priority=dd_cfg.get("source_priority") or SOURCE_PRIORITY,
+            title_threshold=float(dd_cfg.get("title_threshold", TITLE_THRESHOLD)),
+        )
+    if len(merged) < len(papers):
+        print(f"Merged {len(papers) - len(merged)} cross-source duplicates.")
+    return merged
+
+
+def write_site(cfg: Dict[str, Any], site_data_path: Path, final: List[Paper]) -> None:
+    """Write the full site JSON plus the chunked export (manifest, chunks, search index) next to it."""
+    with metrics.stage("write_site"):
+        save_papers(site_data_path, final)
+        print(f"Wrote {len(final)} papers -> {site_data_path}")
+        export_cfg = cfg.get("site_export", {}) or {}
+        manifest = export_site(
+            final,
+            site_data_path.parent,
+            chunk_size=int(export_cfg.get("chunk_size", CHUNK_SIZE)),
+            search=bool(export_cfg.get("search_index", True)),
+            summary_chars=export_cfg.get("summary_chars", SUMMARY_CHARS),
+            details=bool(export_cfg.get("details", False)),
+            compress=bool(export_cfg.get("compress", False)),
+        )
+    print(f"Wrote {len(manifest['chunks'])} chunks -> {site_data_path.parent / MANIFEST}")
+
+
+def _keep_from(cfg: Dict[str, Any], now: Optional[datetime]) -> Optional[datetime]:
+    retain_days = cfg.get("retain_days")
+    if retain_days is None:
+        return None
+    return (now or datetime.now()) - timedelta(days=int(retain_days))
+
+
+def publish(
+    cfg: Dict[str, Any],
+    fresh: List[Paper],
+    site_data_path: Path,
+    write: bool,
+    now: Optional[datetime] = None,
+) -> List[Paper]:
+    """
+    Merge freshly matched papers into the paper archive (`store.path`) and return
+    the site export: one record per id, newest first, fresh records superseding
+    stored ones. With `write`, the archive is updated and the export is written
+    to `site_data_path`. The archive only grows: papers missing from `fresh`
+    (older than this run's window, backfilled, or from a source that failed)
+    are kept.
+
+    A `.jsonl` archive gets the new records appended (and is compacted once
+    superseded lines exceed `store.compact_garbage`); a `.db`/`.sqlite` archive is
+    upserted by id and the export read back through its indexes.
+    """
+    store_cfg = cfg.get("store", {}) or {}
+    store_path = Path(store_cfg.get("path", "data/papers.jsonl"))
+    keep_from = _keep_from(cfg, now)
+    if is_sqlite_path(store_path):
+        return _publish_sqlite(cfg, store_path, fresh, site_data_path, write, keep_from)
+
+    # First run with an archive: seed it from the existing site export
+    existing_path = store_path if store_path.exists() else site_data_path
+    with metrics.stage("merge"):
+        existing = list(iter_papers(existing_path))
+        merged = [p for p in latest_papers(chain(existing, fresh)) if p.matched_keywords]
+    print(f"Merged with {len(existing)} archived papers -> {len(merged)} total.")
+    final = dedupe_export(cfg, merged if keep_from is None else [p for p in merged if p.published >= keep_from])
+
+    if write:
+        with metrics.stage("store"):
+            if existing_path != store_path:
+                save_papers(store_path, existing)
+            append_papers(store_path, fresh)
+            if compact_papers(store_path, float(store_cfg.get("compact_garbage", 0.2))):
+                print(f"Compacted {store_path}")
+        write_site(cfg, site_data_path, final)
+    return final
+
+
+def _publish_sqlite(
+    cfg: Dict[str, Any],
+    store_path: Path,
+    fresh: List[Paper],
+    site_data_path: Path,
+    write: bool,
+    keep_from: Optional[datetime],
+) -> List[Paper]:
+    with SQLiteStore(store_path) as db:
+        with metrics.stage("store"):
+            if db.count() == 0 and site_data_path.exists():
+                # First run with an archive: seed it from the existing site export
+                db.upsert(iter_papers(site_data_path))
+            db.upsert(fresh)
+        with metrics.stage("merge"):
+            merged = list(db.iter_query(since=keep_from, matched_only=True))
+        final = dedupe_export(cfg, merged)
+        print(f"Archive holds {db.count()} papers; exporting {len(final)}.")
+        if not write:
+            db.rollback()  # dry run: leave the archive untouched
+    if write:
+        write_site(cfg, site_data_path, final)
+    return final
+
+
+def backfill(
+    cfg: Dict[str, Any],
+    keywords: List[str],
+    categories: List[str],
+    start: date,
+    end: date,
+    shard_days: Optional[int],
+    site_data_path: Path,
+    write: bool,
+) -> int:
+    """Fetch [start, end] in date shards for every enabled source and merge the matches into the site data."""
+    bf_cfg = cfg.get("backfill", {}) or {}
+    shards = date_shards(start, end, shard_days or int(bf_cfg.get("shard_days", 7)))
+    sources = enabled_sources(cfg)
+    bio_only = bool(cfg.get("bio_only", True))
+    checkpoint = Checkpoint(bf_cfg.get("checkpoint_dir", "data/backfill"))
+    processes = int(bf_cfg.get("processes") or 1)
+    # One process pool shared by every shard worker, so matching uses `processes` cores in total
+    pool_cm = matcher_pool(_matcher(tuple(keywords)), processes) if processes > 1 else nullcontext()
+
+    print(f"Backfilling {start}..{end}: {len(shards)} shards x {len(sources)} sources")
+    with metrics.stage("backfill"), pool_cm as pool:
+
+        def shard_task(source: str, start_str: str, end_str: str) -> Iterable[Paper]:
+            fetch = build_fetch_tasks(cfg, keywords, categories, {source: (start_str, end_str)})[source]
+            since = datetime.strptime(start_str, "%Y-%m-%d")
+            return select_matches(source, fetch(), since, keywords, bio_only, {}, processes=processes, pool=pool)
+
+        results = run_backfill(shard_task, sources, shards, checkpoint, workers=bf_cfg.get("workers"))
+    skipped = sum(1 for r in results if r.skipped)
+    failed = [r for r in results if r.error is not None]
+    print(f"Shards: {len(results) - skipped - len(failed)} fetched, {skipped} already done, {len(failed)} failed")
+
+    # Merge every checkpointed shard of this range (including earlier runs) into the archive
+    backfilled = checkpoint.load(sources, shards)
+    print(f"Backfilled {len(backfilled)} papers.")
+    publish(cfg, backfilled, site_data_path, write)
+    if failed:
+        print("Some shards failed; re-run the same command to resume.")
+        return 1
+    return 0
 
 
 def main(argv: List[str]) -> int:
     ap = argparse.ArgumentParser(description="Fetch and update papers JSON for the site.")
     ap.add_argument("--config", default="config.yaml", help="Path to config.yaml")
     ap.add_argument("--days", type=int, default=None, help="Override days_back")
-    ap.add_argument("--max-results", type=int, default=None, help="Override max_results per keyword")
+    ap.add_argument("--max-results", type=int, default=None, help="Override max_results (cap per source)")
+    ap.add_argument("--timeout", type=float, default=None, help="Override fetch.timeout (seconds per source)")
     ap.add_argument("--write", action="store_true", help="Write outputs to site/data/papers.json")
+    ap.add_argument("--offline", action="store_true", help="Replay cached HTTP responses only; never touch the network")
+    ap.add_argument("--no-cache", action="store_true", help="Bypass the on-disk HTTP response cache")
+    ap.add_argument(
+        "--full",
+        action="store_true",
+        help="Ignore watermarks and refetch the full days_back window (merged into the archive like any run)",
+    )
+    ap.add_argument(
+        "--backfill",
+        nargs=2,
+        metavar=("START", "END"),
+        type=date.fromisoformat,
+        default=None,
+        help="Fetch the archive between two dates (YYYY-MM-DD) in resumable date shards",
+    )
+    ap.add_argument("--shard-days", type=int, default=None, help="Override backfill.shard_days")
+    ap.add_argument("--report", default=None, help="Write a JSON run report (stage timings, per-source HTTP and paper counts)")
+    ap.add_argument("--prom", default=None, help="Write the run report as a Prometheus textfile")
     args = ap.parse_args(argv)
+    metrics.reset()
+    rc = run(args)
+    rep = metrics.report()
+    rss = rep["peak_rss_bytes"]
+    print(f"Done in {rep['wall_seconds']:.1f}s" + (f", peak RSS {rss / 2**20:.0f} MB" if rss else ""))
+    if args.report:
+        metrics.write_report(args.report, rep)
+    if args.prom:
+        metrics.write_prometheus(args.prom, rep)
+    return rc
+
+
+def run(args: argparse.Namespace) -> int:
+    """One update (or backfill) run as set up by the command line `args`."""
 
     cfg = load_config(Path(args.config))
+    configure_cache(cfg, offline=args.offline, disabled=args.no_cache)
+    configure_upstreams(cfg)
     keywords = cfg.get("keywords", [])
     categories = cfg.get("categories", [])
     days_back = args.days if args.days is not None else int(cfg.get("days_back", 7))
-    max_results = args.max_results if args.max_results is not None else int(cfg.get("max_results", 100))
+    max_results = args.max_results if args.max_results is not None else cfg.get("max_results")
+    max_results = int(max_results) if max_results is not None else None
     site_data_path = Path(cfg.get("site_data_path", "site/data/papers.json"))
+    fetch_cfg = cfg.get("fetch", {}) or {}
+    fetch_timeout = args.timeout if args.timeout is not None else fetch_cfg.get("timeout")
+    fetch_timeouts = {k: float(v) for k, v in (fetch_cfg.get("timeouts", {}) or {}).items()}
+    incremental = bool(cfg.get("incremental", True)) and not args.full
+    watermarks_path = Path(cfg.get("watermarks_path", "data/watermarks.json"))
+
+    if args.backfill:
+        start, end = args.backfill
+        return backfill(cfg, keywords, categories, start, end, args.shard_days, site_data_path, args.write)
 
     print(f"Fetching papers for {len(keywords)} keywords, days_back={days_back}...")
 
@@ -115,84 +399,63 @@ def main(argv: List[str]) -> int:
     # Date range strings
     now = datetime.now(timezone.utc).astimezone(tz=None).replace(tzinfo=None)
     cutoff = now - timedelta(days=days_back)
-    start_str = cutoff.strftime("%Y-%m-%d")
     end_str = now.strftime("%Y-%m-%d")
 
-    sources_cfg = cfg.get("sources", {})
+    # Per-source window start: the source's watermark (minus its overlap) in incremental mode
+    marks = load_watermarks(watermarks_path)
+    overlap = cfg.get("overlap_days")
+    starts = {
+        s: window_start(marks, s, cutoff, timedelta(days=overlap_days(overlap, s, days_back))) if incremental else cutoff
+        for s in enabled_sources(cfg)
+    }
+    windows = {s: (start.strftime("%Y-%m-%d"), end_str) for s, start in starts.items()}
+    for s, start in starts.items():
+        if start > cutoff:
+            print(f"[{s}] incremental from {start.strftime('%Y-%m-%d')}")
+
     bio_only = bool(cfg.get("bio_only", True))
-    include_arxiv = bool(sources_cfg.get("arxiv", True))
-    include_bio = bool(sources_cfg.get("biorxiv", False))
-    include_med = bool(sources_cfg.get("medrxiv", False))
-    include_pub = bool(sources_cfg.get("pubmed", False))
-    include_chem = bool(sources_cfg.get("chemrxiv", False))
-
-    if include_arxiv:
-        fetched = fetch_arxiv_papers(keywords=keywords, categories=categories, max_results=max_results)
-        for p in fetched:
-            if p.published >= cutoff:
-                hits = match_keywords(p, keywords)
-                if hits:
-                    p.matched_keywords = hits
-                    all_papers.append(p)
-
-    if include_bio:
-        fetched = fetch_rxiv("biorxiv", start_str, end_str, max_results=max_results)
-        for p in fetched:
-            if p.published >= cutoff:
-                hits = match_keywords(p, keywords)
-                if hits:
-                    p.matched_keywords = hits
-                    all_papers.append(p)
-
-    if include_med:
-        fetched = fetch_rxiv("medrxiv", start_str, end_str, max_results=max_results)
-        for p in fetched:
-            if p.published >= cutoff:
-                hits = match_keywords(p, keywords)
-                if hits:
-                    p.matched_keywords = hits
-                    all_papers.append(p)
-
-    if include_pub:
-        pub_email = (cfg.get("pubmed", {}) or {}).get("email")
-        fetched = fetch_pubmed(keywords=keywords, start_date=start_str, end_date=end_str, max_results=max_results, email=pub_email)
-        for p in fetched:
-            if p.published >= cutoff:
-                hits = match_keywords(p, keywords)
-                if hits:
-                    p.matched_keywords = hits
-                    all_papers.append(p)
-
-    if include_chem:
-        fetched = fetch_chemrxiv(keywords=keywords, start_date=start_str, end_date=end_str, max_results=max_results)
-        for p in fetched:
-            if p.published >= cutoff:
-                hits = match_keywords(p, keywords)
-                if hits:
-                    # Optional biology context gate for ChemRxiv
-                    if not bio_only or _is_bio_context(p.title + "\n" + p.summary):
-                        p.matched_keywords = hits
-                        all_papers.append(p)
-
-def _is_bio_context(text: str) -> bool:
-    """Heuristic: require at least one biological token in text."""
-    bio_tokens = {
-        "dna", "rna", "protein", "proteins", "gene", "genes", "genome", "genomic", "genetics",
-        "cell", "cells", "cellular", "tissue", "organism", "mouse", "mice", "human", "yeast", "bacteria",
-        "mitochondria", "chromatin", "chromosome", "repair", "biological",
+    stats: Dict[str, Dict[str, Any]] = {s: {} for s in windows}
+
+    def matching(source: str, fetch: FetchTask) -> FetchTask:
+        return lambda: select_matches(
+            source, metrics.timed_iter(source, "fetch_seconds", fetch(), wait="wait_seconds"), starts[source], keywords, bio_only, stats[source]
+        )
+
+    tasks = {
+        source: matching(source, fetch)
+        for source, fetch in build_fetch_tasks(cfg, keywords, categories, windows, max_results).items()
     }
-    text_l = text.lower()
-    words = set(re.findall(r"[a-zA-Z]+", text_l))
-    return any(tok in words for tok in bio_tokens)
+    with metrics.stage("fetch"):
+        results = fetch_all(
+            tasks,
+            timeout=float(fetch_timeout) if fetch_timeout is not None else None,
+            timeouts=fetch_timeouts,
+        )
+
+    for name, res in results.items():
+        metrics.count(name, "fetched", stats[name].get("fetched", 0))
+        if not res.ok:
+            metrics.count(name, "failed")
+            print(f"[{name}] failed after {res.elapsed:.1f}s: {res.error}")
+            continue
+        metrics.count(name, "matched", len(res.papers))
+        print(f"[{name}] fetched {stats[name].get('fetched', 0)} papers, {len(res.papers)} matched in {res.elapsed:.1f}s")
+        all_papers.extend(res.papers)
 
-    # Dedupe + sort, then keep only those that matched at least one keyword
-    final = [p for p in dedupe_and_sort(all_papers) if p.matched_keywords]
+    print(f"Collected {len(all_papers)} matching papers across sources.")
 
-    print(f"Collected {len(final)} papers across sources within last {days_back} days.")
+    # Append to the archive and export the site data
+    final = publish(cfg, all_papers, site_data_path, args.write, now=now)
+    exported = {p.id for p in final}
+    for name, res in results.items():
+        # Matched this run and still in the export after the archive merge, retention and dedupe
+        metrics.count(name, "kept", sum(1 for p in res.papers if p.id in exported))
 
     if args.write:
-        save_papers(site_data_path, final)
-        print(f"Wrote {len(final)} papers -> {site_data_path}")
+        for name, res in results.items():
+            if res.ok:
+                advance(marks, name, stats[name].get("newest"), now)
+        save_watermarks(watermarks_path, marks)
     else:
         # Dry-run summary
         for p in final[:10]:
@@ -1,22 +1,181 @@
+const PAGE_SIZE = 50; // cards appended per scroll step
+const SUMMARY_CHARS = 240; // abstract length shown on a card when reading papers.json
+
 const state = {
-  papers: [],
+  manifest: null,
+  offsets: [], // position of each chunk's first paper (positions count from the newest paper)
+  chunks: [], // loaded chunk contents, by manifest index
+  shards: null, // search: token prefix -> shard file
+  shardCache: new Map(),
+  facets: null,
   selectedKeywords: new Set(),
   search: "",
   sort: "newest",
+  results: null, // matching positions, newest first, or null for "everything"
+  shown: 0,
+  busy: false,
+  generation: 0, // bumped on every filter/sort change to drop stale searches
+  renderGen: 0, // generation whose results are on screen
 };
 
+async function fetchJSON(url, opts) {
+  const res = await fetch(url, opts);
+  if (!res.ok) throw new Error(`${url}: ${res.status}`);
+  return res.json();
+}
+
 async function loadData() {
-  const res = await fetch("./data/papers.json", { cache: "no-store" });
-  const data = await res.json();
-  state.papers = Array.isArray(data) ? data : data.papers;
+  // The manifest is small and always revalidated; everything it points to is content-hashed
+  try {
+    state.manifest = await fetchJSON("./data/manifest.json", { cache: "no-cache" });
+  } catch (e) {
+    // Older deployments only have the single papers.json
+    const data = await fetchJSON("./data/papers.json", { cache: "no-cache" });
+    const papers = (Array.isArray(data) ? data : data.papers).slice();
+    papers.sort((a, b) => new Date(b.published).getTime() - new Date(a.published).getTime());
+    state.manifest = { total: papers.length, chunks: [{ count: papers.length }], keywords: null, summary_chars: SUMMARY_CHARS };
+    state.chunks[0] = papers;
+  }
+  let pos = 0;
+  state.offsets = state.manifest.chunks.map(c => (pos += c.count) - c.count);
   renderKeywords();
-  renderList();
+  resetList();
+}
+
+async function loadChunk(i) {
+  if (!state.chunks[i]) state.chunks[i] = await fetchJSON(`./data/${state.manifest.chunks[i].file}`);
+  return state.chunks[i];
+}
+
+function chunkOf(pos) {
+  let lo = 0, hi = state.offsets.length - 1;
+  while (lo < hi) {
+    const mid = (lo + hi + 1) >> 1;
+    if (state.offsets[mid] <= pos) lo = mid;
+    else hi = mid - 1;
+  }
+  return lo;
+}
+
+async function papersAt(positions) {
+  const needed = [...new Set(positions.map(chunkOf))];
+  await Promise.all(needed.map(loadChunk));
+  return positions.map(pos => {
+    const c = chunkOf(pos);
+    return state.chunks[c][pos - state.offsets[c]];
+  });
+}
+
+// ---- search index -------------------------------------------------------
+// Doc ids count from the oldest paper: position = total - 1 - id.
+
+function tokenize(text) {
+  const s = state.manifest.search;
+  const stop = s._stop || (s._stop = new Set(s.stopwords));
+  const tokens = text.normalize("NFKD").replace(/\p{M}/gu, "").toLowerCase().match(/[a-z0-9]+/g) || [];
+  return tokens.filter(t => t.length >= s.min_token_len && !stop.has(t));
+}
+
+function newBitmap() {
+  return new Uint32Array(Math.ceil(state.manifest.total / 32));
+}
+
+function decodeBitmap(b64) {
+  const bytes = Uint8Array.from(atob(b64), c => c.charCodeAt(0));
+  return new Uint32Array(bytes.buffer);
+}
+
+function and(a, b) {
+  if (!a) return b;
+  for (let i = 0; i < a.length; i++) a[i] &= b[i];
+  return a;
+}
+
+async function facet(kind, name) {
+  if (!state.facets) state.facets = await fetchJSON(`./data/${state.manifest.search.facets}`);
+  const b64 = (state.facets[kind] || {})[name];
+  return b64 ? decodeBitmap(b64) : newBitmap();
+}
+
+async function tokenBits(token) {
+  // Prefix match, so the word being typed already narrows the results
+  const s = state.manifest.search;
+  if (!state.shards) state.shards = await fetchJSON(`./data/${s.shards}`);
+  const bits = newBitmap();
+  const file = state.shards[token.slice(0, s.prefix_len)];
+  if (!file) return bits;
+  if (!state.shardCache.has(file)) state.shardCache.set(file, await fetchJSON(`./data/${file}`));
+  for (const [t, deltas] of Object.entries(state.shardCache.get(file))) {
+    if (!t.startsWith(token)) continue;
+    let id = 0;
+    for (const d of deltas) {
+      id += d;
+      bits[id >> 5] |= 1 << (id & 31);
+    }
+  }
+  return bits;
+}
+
+function positionsFromBits(bits) {
+  const total = state.manifest.total;
+  const out = [];
+  // Highest doc id = newest paper
+  for (let w = bits.length - 1; w >= 0; w--) {
+    let word = bits[w];
+    while (word) {
+      const b = 31 - Math.clz32(word);
+      word &= ~(1 << b);
+      const id = (w << 5) + b;
+      if (id < total) out.push(total - 1 - id);
+    }
+  }
+  return out;
+}
+
+// Without an index (old exports): scan every chunk
+function matches(p) {
+  const q = state.search.trim().toLowerCase();
+  if (q) {
+    const text = `${p.title}\n${p.summary}`.toLowerCase();
+    if (!text.includes(q)) return false;
+  }
+  if (state.selectedKeywords.size > 0) {
+    const kws = new Set(p.matched_keywords || []);
+    for (const k of state.selectedKeywords) {
+      if (!kws.has(k)) return false;
+    }
+  }
+  return true;
 }
 
+async function scanAll() {
+  const out = [];
+  for (let c = 0; c < state.manifest.chunks.length; c++) {
+    const papers = await loadChunk(c);
+    papers.forEach((p, i) => { if (matches(p)) out.push(state.offsets[c] + i); });
+  }
+  return out;
+}
+
+async function computeResults() {
+  const hasQuery = state.search.trim() !== "";
+  if (!hasQuery && state.selectedKeywords.size === 0) return null;
+  if (!state.manifest.search) return scanAll();
+  const tokens = hasQuery ? tokenize(state.search) : [];
+  if (!tokens.length && state.selectedKeywords.size === 0) return null;
+  let bits = null;
+  for (const k of state.selectedKeywords) bits = and(bits, await facet("keywords", k));
+  for (const t of tokens) bits = and(bits, await tokenBits(t));
+  return positionsFromBits(bits);
+}
+
+// ---- rendering ----------------------------------------------------------
+
 function uniqueKeywords() {
+  if (state.manifest.keywords) return state.manifest.keywords;
   const set = new Set();
-  for (const p of state.papers) {
-    (p.matched_keywords || []).forEach(k => set.add(k));
+  for (const papers of state.chunks) {
+    for (const p of papers || []) (p.matched_keywords || []).forEach(k => set.add(k));
   }
   return Array.from(set).sort((a, b) => a.localeCompare(b));
 }
@@ -35,7 +194,7 @@ function renderKeywords() {
       if (state.selectedKeywords.has(k)) state.selectedKeywords.delete(k);
       else state.selectedKeywords.add(k);
       renderKeywords();
-      renderList();
+      resetList();
     };
     container.appendChild(btn);
   }
@@ -46,63 +205,143 @@ function fmtDate(iso) {
   return d.toISOString().slice(0, 10);
 }
 
-function renderList() {
-  const list = document.getElementById("list");
-  list.innerHTML = "";
+function el(tag, className, text) {
+  const node = document.createElement(tag);
+  if (className) node.className = className;
+  if (text != null) node.textContent = text;
+  return node;
+}
 
-  const q = state.search.trim().toLowerCase();
-  const hasKW = state.selectedKeywords.size > 0;
+function safeHref(url) {
+  // Only link out to http(s); anything else (javascript:, data:, ...) stays plain text
+  try {
+    const u = new URL(url, location.href);
+    return u.protocol === "http:" || u.protocol === "https:" ? u.href : null;
+  } catch {
+    return null;
+  }
+}
 
-  let items = state.papers.slice();
+function renderCard(p) {
+  // Titles, authors and abstracts come from upstream APIs: always set them as text, never as HTML
+  const card = el("div", "card");
+  // Exported chunks are already cut to the manifest's summary_chars (and flag it with `more`); papers.json is not
+  const limit = state.manifest.summary_chars;
+  const full = p.summary || "";
+  const cut = p.more || (limit != null && full.length > limit);
+  const summary = limit != null ? full.slice(0, limit) : full;
 
-  items = items.filter(p => {
-    if (q) {
-      const text = `${p.title}\n${p.summary}`.toLowerCase();
-      if (!text.includes(q)) return false;
-    }
-    if (hasKW) {
-      const kws = new Set(p.matched_keywords || []);
-      for (const k of state.selectedKeywords) {
-        if (!kws.has(k)) return false;
-      }
-    }
-    return true;
-  });
+  const h3 = el("h3");
+  const href = safeHref(p.link);
+  if (href) {
+    const a = el("a", null, p.title || "");
+    a.setAttribute("href", href);
+    a.setAttribute("target", "_blank");
+    a.setAttribute("rel", "noopener noreferrer");
+    h3.appendChild(a);
+  } else {
+    h3.textContent = p.title || "";
+  }
+  card.appendChild(h3);
+  card.appendChild(el("div", "meta", `${fmtDate(p.published)} · ${p.authors?.slice(0, 5).join(", ") || ""}`));
+  const summaryEl = el("div", "summary", summary + (cut ? "…" : ""));
+  card.appendChild(summaryEl);
+  const tags = el("div", "tags");
+  tags.style.marginTop = "8px";
+  for (const t of [p.source, ...(p.categories || []), ...(p.matched_keywords || [])]) {
+    if (t) tags.appendChild(el("span", "tag", t));
+  }
+  card.appendChild(tags);
 
-  items.sort((a, b) => {
-    const da = new Date(a.published).getTime();
-    const db = new Date(b.published).getTime();
-    return state.sort === "newest" ? db - da : da - db;
-  });
+  if (cut && p.detail) {
+    // The chunk only carries the start of the abstract; the detail file has the rest
+    const more = el("button", "more", "more");
+    more.onclick = async () => {
+      more.disabled = true;
+      const record = await fetchJSON(`./data/${p.detail}`);
+      summaryEl.textContent = record.summary || "";
+      more.remove();
+    };
+    summaryEl.after(more);
+  }
+  return card;
+}
+
+function resultCount() {
+  return state.results ? state.results.length : state.manifest.total;
+}
+
+// Position (newest = 0) of the k-th displayed paper
+function positionAt(k) {
+  const n = resultCount();
+  const i = state.sort === "newest" ? k : n - 1 - k;
+  return state.results ? state.results[i] : i;
+}
 
-  for (const p of items) {
-    const card = document.createElement("div");
-    card.className = "card";
-    const cats = (p.categories || []).map(c => `<span class="tag">${c}</span>`).join(" ");
-    const src = p.source ? `<span class="tag">${p.source}</span>` : "";
-    const kws = (p.matched_keywords || []).map(k => `<span class="tag">${k}</span>`).join(" ");
-
-    card.innerHTML = `
-      <h3><a href="${p.link}" target="_blank" rel="noopener noreferrer">${p.title}</a></h3>
-      <div class="meta">${fmtDate(p.published)} · ${p.authors?.slice(0, 5).join(", ") || ""}</div>
-      <div>${(p.summary || "").slice(0, 240)}${(p.summary || "").length > 240 ? "…" : ""}</div>
-      <div class="tags" style="margin-top:8px;">${src} ${cats} ${kws}</div>
-    `;
-    list.appendChild(card);
+async function resetList() {
+  const gen = ++state.generation;
+  const results = await computeResults();
+  if (gen !== state.generation) return;
+  state.results = results;
+  state.renderGen = gen;
+  state.shown = 0;
+  document.getElementById("list").innerHTML = "";
+  fill();
+}
+
+function sentinelVisible() {
+  const rect = document.getElementById("sentinel").getBoundingClientRect();
+  return rect.top < window.innerHeight + 600;
+}
+
+// Append cards (fetching the chunks they live in) until the sentinel is off-screen
+async function fill() {
+  if (state.busy || !state.manifest) return;
+  state.busy = true;
+  const gen = state.renderGen;
+  try {
+    const list = document.getElementById("list");
+    while (gen === state.renderGen && state.shown < resultCount() && sentinelVisible()) {
+      const end = Math.min(resultCount(), state.shown + PAGE_SIZE);
+      const positions = [];
+      for (let k = state.shown; k < end; k++) positions.push(positionAt(k));
+      const papers = await papersAt(positions);
+      if (gen !== state.renderGen) break;
+      const frag = document.createDocumentFragment();
+      for (const p of papers) frag.appendChild(renderCard(p));
+      list.appendChild(frag);
+      state.shown = end;
+      await new Promise(requestAnimationFrame); // let layout move the sentinel
+    }
+  } finally {
+    state.busy = false;
   }
+  if (gen !== state.renderGen) fill();
+}
+
+function debounce(fn, ms) {
+  let t;
+  return (...args) => {
+    clearTimeout(t);
+    t = setTimeout(() => fn(...args), ms);
+  };
 }
 
 function wireControls() {
   const search = document.getElementById("search");
   const sort = document.getElementById("sort");
+  const refilter = debounce(resetList, 100);
   search.oninput = (e) => {
     state.search = e.target.value;
-    renderList();
+    refilter();
   };
   sort.onchange = (e) => {
     state.sort = e.target.value;
-    renderList();
+    resetList();
   };
+  new IntersectionObserver(entries => {
+    if (entries.some(e => e.isIntersecting)) fill();
+  }, { rootMargin: "600px" }).observe(document.getElementById("sentinel"));
 }
 
 wireControls();
@@ -0,0 +1,32 @@
+#!/usr/bin/env python3
+"""Check that ChemRxiv (Crossref JATS) abstracts come out as plain text"""
+
+import sys
+from pathlib import Path
+ROOT = Path(__file__).resolve().parents[0]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from scipaperbot.fetchers.chemrxiv import _parse_work, _strip_jats
+
+
+def test_strip_jats_removes_escaped_markup():
+    text = _strip_jats("<jats:p>IL&lt;b&gt;6 &lt;img src=x onerror=alert(1)&gt; levels</jats:p>")
+    assert "<" not in text and ">" not in text
+    assert text == "IL 6 levels"
+
+
+def test_parse_work_summary_is_plain_text():
+    paper = _parse_work({
+        "DOI": "10.26434/chemrxiv-2025-x",
+        "title": ["Senescence markers"],
+        "abstract": "<jats:title>Abstract</jats:title><jats:p>DNA &amp; repair &lt;script&gt;x&lt;/script&gt;</jats:p>",
+    })
+    assert "<" not in paper.summary
+    assert paper.summary == "Abstract DNA & repair x"
+
+
+if __name__ == "__main__":
+    test_strip_jats_removes_escaped_markup()
+    test_parse_work_summary_is_plain_text()
+    print("ok")